@@ -10,6 +10,9 @@ import sys
 pgh.noise.init()  # initialize the perlin noise module
 # if numba isn't found no function will be jitted
 
+# press G to switch between the perlin noise and a goal, in the goal mode the particles
+# follow the paths to the goal (left click) around the walls (right click)
+
 
 class FlowField:
     def __init__(self):
@@ -61,12 +64,36 @@ class FlowField:
 
         self.alpha: int = 20  # the alpha value that each line will have
 
+        # the goal mode, the flow field comes from the distances to the goal instead of the noise
+        self.goal_mode: bool = False
+        self.goal: Tuple[int, int] = (self.columns // 2, self.rows // 2)
+        self.walls: np.ndarray = np.zeros((self.columns, self.rows), dtype=np.int32)
+        self.path_grid: pgh.PathGrid = pgh.PathGrid(self.walls, diagonal=True)
+        self.goal_vectors: np.ndarray = np.zeros(
+            (self.columns, self.rows, 2), dtype=np.float64
+        )
+        self.update_goal_vectors()
+
         # /!\ not important
         self.last_update_time: int = -500
 
         self.total = 0
 
+    def update_goal_vectors(self) -> None:
+        # every cell points to the next cell of its path to the goal, one call for all of the particles
+        _, directions = self.path_grid.flow_field(self.goal)
+        # directions are (di, dj) so they are flipped to (x, y)
+        self.goal_vectors[:] = directions[..., ::-1]
+        lengths = np.linalg.norm(self.goal_vectors, axis=2, keepdims=True)
+        np.divide(self.goal_vectors, lengths, out=self.goal_vectors, where=lengths > 0)
+
     def update(self) -> None:
+        if self.goal_mode:
+            # the walls are drawn over the trails
+            for i, j in np.argwhere(self.walls):
+                self.WIN.fill(pgh.GREY, (j * self.w, i * self.w, self.w, self.w))
+            return
+
         # create vectors based on the perlin noise values with polar to cartesian coordinate transformation
         # x = r * cos(θ)
         # y = r * sin(θ)
@@ -120,6 +147,22 @@ class FlowField:
                         self.particles.append(
                             (p, pygame.math.Vector2(), pygame.math.Vector2(p))
                         )
+                elif event.key == pygame.K_g:
+                    self.goal_mode = not self.goal_mode
+                    self.WIN.fill((0, 0, 0))
+
+        if not self.goal_mode:
+            return
+        buttons = pygame.mouse.get_pressed(3)
+        x, y = pygame.mouse.get_pos()
+        cell = (min(y // self.w, self.columns - 1), min(x // self.w, self.rows - 1))
+        if buttons[0] and cell != self.goal and not self.walls[cell]:
+            self.goal = cell
+            self.update_goal_vectors()
+        elif buttons[2] and cell != self.goal and not self.walls[cell]:
+            self.walls[cell] = 1
+            self.path_grid.set_cell(*cell, 1)
+            self.update_goal_vectors()
 
     def draw(self) -> None:
         # position, velocity, previous_position
@@ -127,8 +170,11 @@ class FlowField:
             i, j = int(p.y // self.w), int(
                 p.x // self.w
             )  # find the particle's location in the flowfield
-            # formula for translate 2D indexes to 1D: row + column * column_count
-            v += self.perlin_vectors[j + i * self.columns]
+            if self.goal_mode:
+                v += self.goal_vectors[min(i, self.columns - 1), min(j, self.rows - 1)]
+            else:
+                # formula for translate 2D indexes to 1D: row + column * column_count
+                v += self.perlin_vectors[j + i * self.columns]
             if v.magnitude_squared() > 16:
                 v.scale_to_length(4)
             p += v
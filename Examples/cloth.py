@@ -9,9 +9,12 @@ clock = pygame.time.Clock()
 FPS = 60
 
 cloth = pgh.Cloth(pgh.read_json(os.path.join("..", "tools", "cloths", "cloth.cloth")))
+obstacles = [pygame.Rect(250, 450, 200, 40)]
+# the cloth is updated with the same dt no matter the frame time, every step is split in 2 updates
+timestep = pgh.FixedTimestep(step=1, substeps=2)
 
 while True:
-    clock.tick(FPS)
+    dt = clock.tick(FPS) * 60 / 1000  # 1 is one frame at 60 fps
 
     for event in pygame.event.get():
         if event.type == pygame.QUIT or (
@@ -22,9 +25,13 @@ while True:
         if event.type == pygame.MOUSEMOTION:
             cloth.move_locked(event.pos)
 
-    cloth.update()
-    cloth.borders(WIDTH, HEIGHT)
+    for h in timestep.steps(dt):
+        cloth.update(h)
+        cloth.collide(obstacles)
+        cloth.borders(WIDTH, HEIGHT)
 
     WIN.fill(pgh.BLACK)
-    cloth.draw(WIN, pgh.WHITE)
+    for obstacle in obstacles:
+        pygame.draw.rect(WIN, pgh.GREY, obstacle)
+    cloth.draw(WIN, pgh.WHITE, lag=timestep.lag)
     pygame.display.update()
@@ -0,0 +1,63 @@
+import os
+
+# the draw benchmark uses an off-screen surface so no window is needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import time
+import PygameHaze as pgh
+
+
+FRAMES = 10
+
+
+def benchmark(cloth) -> float:
+    cloth.update()  # warm up
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        cloth.update()
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+
+pgh.init()  # compile the numba solvers (if numba is installed)
+
+print(
+    f"{'connections':>12} {'Cloth':>12} {'gauss_seidel':>13} {'colored':>12} {'speedup':>8}"
+)
+for size in (30, 60, 150, 300):
+    # only the structural connections so every cloth has the same work
+    grid = dict(cols=size, rows=size, spacing=5, shear=False, bend=False)
+    gauss_seidel = benchmark(pgh.ClothArray.grid(**grid, solver="gauss_seidel"))
+    colored = pgh.ClothArray.grid(**grid, solver="colored")
+    connections = len(colored.connections)
+    colored = benchmark(colored)
+    if size <= 60:
+        objects = benchmark(pgh.Cloth.grid(**grid))
+        print(
+            f"{connections:>12} {objects:>9.2f} ms {gauss_seidel:>10.2f} ms "
+            f"{colored:>9.2f} ms {objects / colored:>7.2f}x"
+        )
+    else:
+        print(
+            f"{connections:>12} {'-':>12} {gauss_seidel:>10.2f} ms "
+            f"{colored:>9.2f} ms {'-':>8}"
+        )
+
+
+def draw_benchmark(cloth, filled: bool) -> float:
+    surface = pygame.surface.Surface((640, 480))
+    cloth.draw(surface, pgh.WHITE, filled)  # warm up (the quads are found once)
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        cloth.draw(surface, pgh.WHITE, filled)
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+
+# a cloth that is bigger than the surface, only the part that is on the surface is drawn
+grid = dict(cols=150, rows=150, spacing=8, pos=(-300, -200), shear=False, bend=False)
+cloth = pgh.Cloth.grid(**grid)
+array = pgh.ClothArray.grid(**grid)
+print()
+print(f"{'draw (44700 connections)':>26} {'Cloth':>12} {'ClothArray':>12}")
+print(f"{'lines':>26} {draw_benchmark(cloth, False):>9.2f} ms {draw_benchmark(array, False):>9.2f} ms")
+print(f"{'filled':>26} {draw_benchmark(cloth, True):>9.2f} ms {draw_benchmark(array, True):>9.2f} ms")
@@ -0,0 +1,57 @@
+import numpy as np
+import time
+import PygameHaze as pgh
+
+
+SIZE = 2000
+QUERIES = 20
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+pgh.init()  # compile the numba search (if numba is installed)
+
+rng = np.random.default_rng(0)
+# a big map with random obstacles and a few long walls
+grid = (rng.random((SIZE, SIZE)) < 0.2).astype(np.int32)
+for _ in range(40):
+    i, j = rng.integers(SIZE, size=2)
+    grid[i, max(j - 300, 0) : j + 300] = 1
+
+free = np.argwhere(grid == 0)
+picks = rng.integers(len(free), size=(QUERIES, 2))
+queries = [(tuple(free[a]), tuple(free[b])) for a, b in picks]
+
+path_grid = pgh.PathGrid(grid)
+hierarchical, build = timed(pgh.HierarchicalPathGrid, grid, 16)
+hierarchical.find(queries[0][0], queries[0][1])  # the clusters are calculated on the first find
+print(f"{SIZE}x{SIZE} grid, {QUERIES} queries")
+print(f"clusters calculated in {build + timed(hierarchical.find, *queries[0])[1]:.0f} ms")
+
+total_astar = total_hierarchical = 0.0
+length_astar = length_hierarchical = 0
+for a, b in queries:
+    path, elapsed = timed(path_grid.find, a, b)
+    total_astar += elapsed
+    length_astar += len(path)
+    path, elapsed = timed(hierarchical.find, a, b)
+    total_hierarchical += elapsed
+    length_hierarchical += len(path)
+print(f"{'':>12} {'time':>10} {'path length':>12}")
+print(f"{'A*':>12} {total_astar / QUERIES:>7.2f} ms {length_astar / QUERIES:>12.1f}")
+print(
+    f"{'HPA*':>12} {total_hierarchical / QUERIES:>7.2f} ms "
+    f"{length_hierarchical / QUERIES:>12.1f}"
+)
+
+# a wall edit only changes its cluster (and the clusters next to it)
+edits = 0.0
+for a, b in queries:
+    i, j = free[rng.integers(len(free))]
+    hierarchical.set_cell(i, j, 1)
+    edits += timed(hierarchical.find, a, b)[1]
+print(f"{'edit + HPA*':>12} {edits / QUERIES:>7.2f} ms")
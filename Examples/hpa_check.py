@@ -0,0 +1,53 @@
+import numpy as np
+import math
+import PygameHaze as pgh
+
+
+# the clusters of a HierarchicalPathGrid that is edited cell by cell must give the same
+# paths as a new HierarchicalPathGrid that is made from the edited grid
+
+
+def path_cost(costs, path, end):
+    cells = path + [end]
+    total = 0.0
+    for (i, j), (ni, nj) in zip(cells, cells[1:]):
+        total += costs[ni, nj] * (math.sqrt(2) if i != ni and j != nj else 1)
+    return total
+
+
+pgh.init()  # compile the numba search (if numba is installed)
+
+# a weighted edit of a cell on a border keeps the entrances of the border
+grid = np.ones((4, 8))
+hierarchical = pgh.HierarchicalPathGrid(grid, 4, weighted=True)
+hierarchical.find((0, 0), (3, 7))
+hierarchical.set_cell(1, 4, 50)
+hierarchical.set_cell(2, 4, 50)
+grid[1:3, 4] = 50
+fresh = pgh.HierarchicalPathGrid(grid, 4, weighted=True)
+a, b = (1, 0), (1, 7)
+assert path_cost(grid, hierarchical.find(a, b), b) == path_cost(grid, fresh.find(a, b), b)
+
+rng = np.random.default_rng(0)
+checks = 0
+for trial in range(40):
+    diagonal = trial % 2 == 1
+    cut_corners = trial % 4 > 1
+    grid = rng.integers(1, 6, (30, 33)).astype(np.float64)
+    grid[rng.random(grid.shape) < 0.2] = -1
+    hierarchical = pgh.HierarchicalPathGrid(grid, 6, True, diagonal, cut_corners)
+    for edit in range(60):
+        i, j = rng.integers(30), rng.integers(33)
+        grid[i, j] = -1 if rng.random() < 0.3 else rng.integers(1, 6)
+        hierarchical.set_cell(i, j, grid[i, j])
+        if edit % 10:
+            continue
+        fresh = pgh.HierarchicalPathGrid(grid, 6, True, diagonal, cut_corners)
+        free = np.argwhere(grid != -1)
+        for a, b in rng.integers(len(free), size=(5, 2)):
+            a, b = tuple(free[a]), tuple(free[b])
+            cost = path_cost(grid, hierarchical.find(a, b), b)
+            expected = path_cost(grid, fresh.find(a, b), b)
+            assert math.isclose(cost, expected), (trial, edit, a, b, cost, expected)
+            checks += 1
+print(f"{checks} paths of the edited grids are the same as the paths of new grids")
@@ -0,0 +1,77 @@
+import numpy as np
+import time
+import PygameHaze as pgh
+
+
+SIZE = 501
+QUERIES = 50
+
+
+def open_grid(rng: np.random.Generator) -> np.ndarray:
+    # a few long walls on an empty map
+    grid = np.zeros((SIZE, SIZE), dtype=np.int32)
+    for _ in range(10):
+        i, j = rng.integers(SIZE, size=2)
+        if rng.random() < 0.5:
+            grid[i, max(j - 100, 0) : j + 100] = 1
+        else:
+            grid[max(i - 100, 0) : i + 100, j] = 1
+    return grid
+
+
+def maze_grid(rng: np.random.Generator) -> np.ndarray:
+    # a maze carved by a depth first search, the cells are on the odd rows and columns
+    grid = np.ones((SIZE, SIZE), dtype=np.int32)
+    grid[1, 1] = 0
+    stack = [(1, 1)]
+    while stack:
+        i, j = stack[-1]
+        options = [
+            (i + di, j + dj)
+            for di, dj in ((2, 0), (-2, 0), (0, 2), (0, -2))
+            if 0 < i + di < SIZE and 0 < j + dj < SIZE and grid[i + di, j + dj]
+        ]
+        if not options:
+            stack.pop()
+            continue
+        ni, nj = options[rng.integers(len(options))]
+        grid[(i + ni) // 2, (j + nj) // 2] = 0
+        grid[ni, nj] = 0
+        stack.append((ni, nj))
+    return grid
+
+
+def cluttered_grid(rng: np.random.Generator) -> np.ndarray:
+    # random walls on a quarter of the cells
+    return (rng.random((SIZE, SIZE)) < 0.25).astype(np.int32)
+
+
+def benchmark(path_grid, queries):
+    expanded = 0
+    start = time.perf_counter()
+    for a, b in queries:
+        path_grid.find(a, b)
+        expanded += path_grid.expanded
+    elapsed = (time.perf_counter() - start) / len(queries) * 1000
+    return elapsed, expanded // len(queries)
+
+
+pgh.init()  # compile the numba searches (if numba is installed)
+
+rng = np.random.default_rng(0)
+print(
+    f"{'grid':>10} {'moves':>6} {'A* time':>10} {'A* expanded':>12} "
+    f"{'JPS time':>10} {'JPS expanded':>13} {'speedup':>8}"
+)
+for name, make in (("open", open_grid), ("maze", maze_grid), ("cluttered", cluttered_grid)):
+    grid = make(rng)
+    free = np.argwhere(grid == 0)
+    picks = rng.integers(len(free), size=(QUERIES, 2))
+    queries = [(tuple(free[a]), tuple(free[b])) for a, b in picks]
+    for diagonal in (False, True):
+        astar = benchmark(pgh.PathGrid(grid, diagonal=diagonal), queries)
+        jps = benchmark(pgh.PathGrid(grid, diagonal=diagonal, search="jps"), queries)
+        print(
+            f"{name:>10} {8 if diagonal else 4:>6} {astar[0]:>7.2f} ms {astar[1]:>12} "
+            f"{jps[0]:>7.2f} ms {jps[1]:>13} {astar[0] / jps[0]:>7.1f}x"
+        )
@@ -1,5 +1,4 @@
 import pygame
-import random
 import time
 import PygameHaze as pgh
 
@@ -12,7 +11,8 @@ WIN = pygame.display.set_mode((WIDTH, HEIGHT))
 
 pygame.display.set_caption("Particle example")
 
-particles = pgh.ParticleManager()
+# the particles are stored in numpy arrays and they are updated all together
+particles = pgh.ParticleManager(vectorized=True, capacity=10_000)
 
 rects = [
     pygame.Rect(100, 100, 100, 50),
@@ -42,17 +42,18 @@ while True:
     particles.update(dt, rects)
 
     if pygame.mouse.get_pressed(3)[0]:
-        for _ in range(50):
-            particles.add_particle(
-                *pygame.mouse.get_pos(),
-                random.uniform(-3, 3),
-                random.uniform(-3, 3),
-                random.uniform(0.1, 0.3),
-                random.randrange(7, 10),
-                (255, 255, 255),
-                5,
-                0.1
-            )
+        # the tuples are ranges, every particle gets a random value between them
+        particles.emit(
+            50,
+            *pygame.mouse.get_pos(),
+            vel_x=(-3, 3),
+            vel_y=(-3, 3),
+            shrink_amount=(0.1, 0.3),
+            size=(7, 10),
+            color=(255, 255, 255),
+            collision_tolerance=5,
+            gravity=0.1
+        )
 
     for event in pygame.event.get():
         if (
@@ -0,0 +1,48 @@
+import os
+
+# the benchmark draws on an off-screen surface so no window is needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import time
+import PygameHaze as pgh
+
+
+pygame.init()
+
+WIDTH, HEIGHT = 1280, 720
+FRAMES = 20
+
+surface = pygame.surface.Surface((WIDTH, HEIGHT))
+
+
+def benchmark(count: int, batched: bool) -> float:
+    particles = pgh.ParticleManager(vectorized=True, capacity=count)
+    particles.emit(
+        count,
+        x=(0, WIDTH),
+        y=(0, HEIGHT),
+        vel_x=(-1, 1),
+        vel_y=(-1, 1),
+        shrink_amount=0,
+        size=(2, 6),
+        color=pgh.WHITE,
+    )
+    particles.draw(surface, batched)  # warm up the sprite cache
+
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        surface.fill(pgh.BLACK)
+        particles.draw(surface, batched)
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+
+print(f"{'particles':>10} {'draw.circle':>14} {'blits':>14} {'speedup':>8}")
+for count in (10_000, 50_000):
+    circles = benchmark(count, False)
+    blits = benchmark(count, True)
+    print(
+        f"{count:>10} {circles:>11.2f} ms {blits:>11.2f} ms {circles / blits:>7.2f}x"
+    )
+
+pygame.quit()
@@ -0,0 +1,144 @@
+import numpy as np
+import pygame
+import PygameHaze as pgh
+import PygameHaze.Classes.particle as particle_module
+from PygameHaze.utils import _numba_utils as nbu
+
+
+# ParticleArray.update (with the compiled kernel and with numpy) must move the particles
+# the same way as Particle.update, the particles collide with a few rects for FRAMES frames
+# and the positions, the velocities and the frames that every particle died at are compared
+
+FRAMES = 120
+COUNT = 2000
+DT = 1
+
+
+class FloatRect:
+    # pygame.Rect keeps integer positions, so the Particle objects use a rect with float
+    # positions and everything else is the same code as Particle.update
+    def __init__(self, x, y, w, h):
+        self.x, self.y, self.w, self.h = float(x), float(y), float(w), float(h)
+
+    left = property(lambda self: self.x)
+    top = property(lambda self: self.y)
+    right = property(lambda self: self.x + self.w)
+    bottom = property(lambda self: self.y + self.h)
+    topleft = property(lambda self: (self.x, self.y))
+
+    def copy(self):
+        return FloatRect(self.x, self.y, self.w, self.h)
+
+    def colliderect(self, other):
+        # the same as pygame.Rect.colliderect, an empty rect doesnt collide
+        if self.w <= 0 or self.h <= 0 or other.w <= 0 or other.h <= 0:
+            return False
+        return (
+            self.x < other.right
+            and other.x < self.right
+            and self.y < other.bottom
+            and other.y < self.bottom
+        )
+
+
+class FloatPygame:
+    Rect = FloatRect
+
+
+def simulate_objects(values, rects):
+    particle_module.pygame = FloatPygame
+    try:
+        particles = [pgh.Particle(*particle) for particle in values]
+        rects = [FloatRect(*rect) for rect in rects]
+        died = np.full(len(particles), -1)
+        for frame in range(FRAMES):
+            for i, particle in enumerate(particles):
+                if died[i] != -1:
+                    continue
+                particle.update(DT, rects)
+                if particle.size <= 0:
+                    died[i] = frame
+    finally:
+        particle_module.pygame = pygame
+    pos = np.array([particle.rect.topleft for particle in particles])
+    vel = np.array([(particle.vel_x, particle.vel_y) for particle in particles])
+    return pos, vel, died
+
+
+def simulate_array(values, rects, use_numba):
+    nbu.USE_NUMBA, old = use_numba, nbu.USE_NUMBA
+    try:
+        particles = pgh.ParticleArray(len(values))
+        columns = np.array(values, dtype=np.float64).T
+        x, y, vel_x, vel_y, shrink, size, _, tolerance, gravity = columns
+        slots = particles.emit(
+            len(values), x, y, vel_x, vel_y, shrink, size, pgh.WHITE, tolerance, gravity
+        )
+        died = np.full(len(values), -1)
+        for frame in range(FRAMES):
+            particles.update(DT, rects)
+            died[(died == -1) & ~particles.alive[slots]] = frame
+    finally:
+        nbu.USE_NUMBA = old
+    pos = particles.pos[slots].copy()
+    vel = particles.vel[slots].copy()
+    # a dead particle keeps its last position but its velocity is cleared
+    return pos, vel, died
+
+
+pgh.init()  # compile the numba kernels (if numba is installed)
+
+rng = np.random.default_rng(0)
+values = [
+    (
+        rng.uniform(0, 800),
+        rng.uniform(0, 300),
+        rng.uniform(-3, 3),
+        rng.uniform(-4, 1),
+        rng.uniform(0.02, 0.1),
+        rng.uniform(2, 8),
+        0,
+        rng.uniform(2, 10),
+        rng.uniform(0.05, 0.2),
+    )
+    for _ in range(COUNT)
+]
+# a few rects use the simple loop, more rects use the broadphase grid
+layouts = {
+    "few rects": [pygame.Rect(100 + 250 * k, 350, 150, 40) for k in range(3)],
+    "many rects": [
+        pygame.Rect(rng.integers(0, 800), rng.integers(100, 600), *rng.integers(20, 120, 2))
+        for _ in range(40)
+    ],
+}
+
+modes = [("numpy", False)] + ([("numba", True)] if nbu.USE_NUMBA else [])
+for name, rects in layouts.items():
+    pos, vel, died = simulate_objects(values, rects)
+    alive = died == -1
+    for mode, use_numba in modes:
+        array_pos, array_vel, array_died = simulate_array(values, rects, use_numba)
+        assert np.array_equal(died, array_died), (name, mode, "lifetimes")
+        assert np.allclose(pos, array_pos, rtol=0, atol=1e-9), (name, mode, "positions")
+        assert np.allclose(vel[alive], array_vel[alive], rtol=0, atol=1e-9), (
+            name,
+            mode,
+            "velocities",
+        )
+    print(
+        f"{name}: {COUNT} particles, {FRAMES} frames, {int((~alive).sum())} died, "
+        f"the same with {' and '.join(mode for mode, _ in modes)}"
+    )
+
+# a bounce keeps the same part of the speed with substeps, one particle falls on a rect
+# without gravity and it is updated with dt=1 and with two steps of dt=0.5
+bounce = [(100.0, 300.0, 1.5, 6.0, 0.0, 4.0, 0, 10.0, 0.0)]
+floor = [pygame.Rect(0, 340, 400, 40)]
+for substeps in (1, 2, 4):
+    FRAMES, DT = 20 * substeps, 1 / substeps
+    _, vel, _ = simulate_objects(bounce, floor)
+    assert np.allclose(vel, [[1.5, -6.0 * 0.75]]), (substeps, "objects", vel)
+    for mode, use_numba in modes:
+        _, array_vel, _ = simulate_array(bounce, floor, use_numba)
+        assert np.allclose(array_vel, vel, rtol=0, atol=1e-12), (substeps, mode)
+print("a bounce keeps 0.75 of the speed with 1, 2 and 4 substeps")
@@ -49,7 +49,7 @@ while True:
                 start = None
                 grid = [[0 for _ in range(rows)] for _ in range(columns)]
             elif event.key == pygame.K_SPACE and end is not None and start is not None:
-                path = pgh.pathfinding(
+                path = pgh.astar(
                     grid, start, end
                 )  # it uses A* to find the optimal path
 
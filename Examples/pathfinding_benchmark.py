@@ -0,0 +1,65 @@
+import numpy as np
+import time
+import PygameHaze as pgh
+
+
+QUERIES = 200
+
+
+def random_queries(grid: np.ndarray, count: int, rng: np.random.Generator):
+    free = np.argwhere(grid == 0)
+    picks = rng.integers(len(free), size=(count, 2))
+    return [(tuple(free[a]), tuple(free[b])) for a, b in picks]
+
+
+def benchmark(find, queries) -> float:
+    start = time.perf_counter()
+    for a, b in queries:
+        find(a, b)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+pgh.init()  # compile the numba search (if numba is installed)
+
+rng = np.random.default_rng(0)
+print(
+    f"{'grid':>10} {'pathfinding':>12} {'astar':>12} {'PathGrid':>12} {'speedup':>8}"
+)
+for size in (50, 100, 250, 500):
+    grid = (rng.random((size, size)) < 0.2).astype(np.int32)
+    queries = random_queries(grid, QUERIES, rng)
+    path_grid = pgh.PathGrid(grid)
+    reused = benchmark(path_grid.find, queries)
+    arrays = benchmark(lambda a, b: pgh.astar(grid, a, b), queries)
+    if size <= 100:
+        # pathfinding is too slow for the bigger grids, a few queries are enough
+        as_list = grid.tolist()
+        objects = benchmark(lambda a, b: pgh.pathfinding(as_list, a, b), queries[:20])
+        print(
+            f"{size:>4}x{size:<5} {objects:>9.2f} ms {arrays:>9.2f} ms "
+            f"{reused:>9.3f} ms {objects / reused:>7.0f}x"
+        )
+    else:
+        print(
+            f"{size:>4}x{size:<5} {'-':>12} {arrays:>9.2f} ms {reused:>9.3f} ms {'-':>8}"
+        )
+
+# the same start and end pairs again and again while a few walls are added
+grid = (rng.random((250, 250)) < 0.2).astype(np.int32)
+pairs = random_queries(grid, 50, rng)
+queries = [pairs[k] for k in rng.integers(len(pairs), size=1000)]
+walls = np.argwhere(grid == 0)[rng.integers(len(np.argwhere(grid == 0)), size=20)]
+print()
+print(f"{'250x250, 1000 queries':>22} {'time':>12} {'hits':>6} {'misses':>7}")
+for cache_size in (0, 64):
+    path_grid = pgh.PathGrid(grid, cache_size=cache_size)
+    start = time.perf_counter()
+    for k, (a, b) in enumerate(queries):
+        if k % 50 == 0:
+            path_grid.set_cell(*walls[k // 50], 1)
+        path_grid.find(a, b)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(
+        f"{f'cache_size={cache_size}':>22} {elapsed:>9.2f} ms "
+        f"{path_grid.cache_hits:>6} {path_grid.cache_misses:>7}"
+    )
@@ -6,11 +6,14 @@ from PygameHaze.Classes.input_field import InputFieldNumbers
 from PygameHaze.Classes.input_field import InputFieldLetters
 from PygameHaze.Classes.animation import Animation
 from PygameHaze.Classes.particle import Particle
+from PygameHaze.Classes.particle import ParticleArray
 from PygameHaze.Classes.font import Font
 from PygameHaze.Classes.cloth import Cloth
+from PygameHaze.Classes.cloth import ClothArray
 from PygameHaze.Classes.cloth import Point
 from PygameHaze.Classes.cloth import Connection
 from PygameHaze.Classes.quadtree import QuadTree
+from PygameHaze.Classes.quadtree import QuadTreeArray
 
 # managers
 from PygameHaze.Classes.managers import ParticleManager
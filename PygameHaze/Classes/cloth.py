@@ -26,12 +26,240 @@ a cloth object made with verlet integration
 """
 
 
-from typing import Tuple, List, Union, Dict
+from typing import Tuple, List, Union, Dict, Optional, Sequence
+import numpy as np
+import itertools
 import math
 import pygame
 
 from PygameHaze.exceptions import NoLockedPoints
+from PygameHaze.utils.spatial import RectGrid
+from PygameHaze.utils.utils import read_cloth_binary, write_cloth_binary
 from PygameHaze.types import *
+import PygameHaze.utils._numba_utils as nbu
+
+
+# the edge (left, right, top, bottom) that a point is pushed to as a column of RectGrid.edges
+_SIDE_EDGES = np.array([0, 2, 1, 3])
+
+
+def _colliders(
+    grid: Optional[RectGrid],
+    rects: Sequence[RectType],
+    circles: Sequence[Tuple[CoordsType, float]],
+) -> Tuple[RectGrid, np.ndarray]:
+    # one grid with the rects and after them the bounding boxes of the circles,
+    # the boxes are padded so they still cover the circles after being turned to integers
+    circles = np.array(
+        [(center[0], center[1], radius) for center, radius in circles], dtype=np.float64
+    ).reshape((-1, 3))
+    boxes = [pygame.Rect(rect) for rect in rects]
+    boxes.extend(
+        pygame.Rect(x - r - 1, y - r - 1, 2 * r + 3, 2 * r + 3)
+        for x, y, r in circles.tolist()
+    )
+    return RectGrid.cached(grid, boxes), circles
+
+
+def _push_out(pos: np.ndarray, grid: RectGrid, circles: np.ndarray) -> np.ndarray:
+    # it moves the positions that are inside of a collider to the closest edge of it
+    # and it returns the indexes of the positions that were moved
+    rect_count = len(grid) - circles.shape[0]
+    points, hits = grid.query(pos[:, 0], pos[:, 1], pos[:, 0], pos[:, 1])
+    if not points.size:
+        return points
+    # the pairs are sorted by the point, a point is pushed by one collider at a time
+    index = np.arange(points.shape[0])
+    first = np.r_[True, points[1:] != points[:-1]]
+    rank = index - np.maximum.accumulate(np.where(first, index, 0))
+    moved = []
+    for r in range(int(rank.max()) + 1):
+        sel = rank == r
+        is_rect = hits[sel] < rect_count
+
+        pts = points[sel][is_rect]
+        edges = grid.edges[hits[sel][is_rect]]
+        x, y = pos[pts, 0], pos[pts, 1]
+        inside = (edges[:, 0] < x) & (x < edges[:, 2]) & (edges[:, 1] < y) & (y < edges[:, 3])
+        pts, edges, x, y = pts[inside], edges[inside], x[inside], y[inside]
+        depth = np.stack(
+            (x - edges[:, 0], edges[:, 2] - x, y - edges[:, 1], edges[:, 3] - y), axis=1
+        )
+        side = depth.argmin(axis=1)
+        pos[pts, side // 2] = edges[np.arange(pts.shape[0]), _SIDE_EDGES[side]]
+        moved.append(pts)
+
+        pts = points[sel][~is_rect]
+        circle = circles[hits[sel][~is_rect] - rect_count]
+        d = pos[pts] - circle[:, :2]
+        distance = np.hypot(d[:, 0], d[:, 1])
+        inside = distance < circle[:, 2]
+        pts, circle, d, distance = pts[inside], circle[inside], d[inside], distance[inside]
+        # a point at the center is pushed up
+        d[distance == 0] = (0, -1)
+        distance[distance == 0] = 1
+        pos[pts] = circle[:, :2] + d * (circle[:, 2] / distance)[:, None]
+        moved.append(pts)
+    return np.unique(np.concatenate(moved))
+
+
+def _edge_keys(a: np.ndarray, b: np.ndarray, n: int) -> np.ndarray:
+    # a number for every connection that doesnt depend on the direction of the connection
+    return np.minimum(a, b) * n + np.maximum(a, b)
+
+
+def _find_quads(pos: np.ndarray, connections: np.ndarray) -> np.ndarray:
+    # the cycles of 4 connections (a-b-c-d) that are a convex polygon, every cycle is found once
+    # from its smallest point a and the two neighbours of a in the cycle (b < d)
+    neighbours: Dict[int, set] = {}
+    for a, b in connections.tolist():
+        if a != b:
+            neighbours.setdefault(a, set()).add(b)
+            neighbours.setdefault(b, set()).add(a)
+    quads = []
+    for a, around in neighbours.items():
+        higher = sorted(n for n in around if n > a)
+        for i, b in enumerate(higher):
+            for d in higher[i + 1 :]:
+                for c in neighbours[b] & neighbours[d]:
+                    if c > a:
+                        quads.append((a, b, c, d))
+    quads = np.array(quads, dtype=np.int64).reshape((-1, 4))
+    corners = pos[quads]
+    sides = np.roll(corners, -1, axis=1) - corners
+    turns = sides[:, :, 0] * np.roll(sides[:, :, 1], -1, axis=1) - sides[:, :, 1] * np.roll(
+        sides[:, :, 0], -1, axis=1
+    )
+    quads = quads[(turns > 0).all(axis=1) | (turns < 0).all(axis=1)]
+    # a quad with a connected diagonal that is shorter than its longest side
+    # is covered by smaller quads (like the ones made by shear connections)
+    corners = pos[quads]
+    longest = np.hypot(*(np.roll(corners, -1, axis=1) - corners).transpose(2, 0, 1)).max(axis=1)
+    keys = _edge_keys(connections[:, 0], connections[:, 1], pos.shape[0])
+    covered = np.zeros(quads.shape[0], dtype=np.bool_)
+    for i, j in ((0, 2), (1, 3)):
+        diagonal = np.hypot(*(corners[:, j] - corners[:, i]).T)
+        connected = np.isin(_edge_keys(quads[:, i], quads[:, j], pos.shape[0]), keys)
+        covered |= connected & (diagonal < longest)
+    return quads[~covered]
+
+
+def _cached_quads(
+    cache: Optional[Tuple[np.ndarray, np.ndarray, int]],
+    pos: np.ndarray,
+    connections: np.ndarray,
+    quads: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    # the quads with the keys of their sides and the connection count that they were checked with,
+    # connections are only removed (tearing) so the quads that lost a side are dropped
+    n = pos.shape[0]
+    if cache is None:
+        if quads is None:
+            quads = _find_quads(pos, connections)
+        sides = _edge_keys(quads, np.roll(quads, -1, axis=1), n)
+        return quads, sides, connections.shape[0]
+    quads, sides, count = cache
+    if count != connections.shape[0]:
+        keys = _edge_keys(connections[:, 0], connections[:, 1], n)
+        alive = np.isin(sides, keys).all(axis=1)
+        quads, sides = quads[alive], sides[alive]
+    return quads, sides, connections.shape[0]
+
+
+def _visible(corners: np.ndarray, clip: pygame.Rect, pad: float) -> np.ndarray:
+    # the shapes (K, corners, 2) that are not fully on one side of the clip area
+    x = corners[:, :, 0]
+    y = corners[:, :, 1]
+    return ~(
+        (x.max(axis=1) < clip.left - pad)
+        | (x.min(axis=1) > clip.right + pad)
+        | (y.max(axis=1) < clip.top - pad)
+        | (y.min(axis=1) > clip.bottom + pad)
+    )
+
+
+def _draw_cloth(
+    surface: pygame.surface.Surface,
+    color: ColorType,
+    pos: np.ndarray,
+    connections: np.ndarray,
+    quads: Optional[np.ndarray],
+    width: int,
+) -> None:
+    # the endpoints of all of the connections are gathered in one array and
+    # only the lines (and quads) that can reach the clip area are drawn
+    clip = surface.get_clip()
+    if quads is not None and quads.shape[0]:
+        corners = pos[quads]
+        polygon = pygame.draw.polygon
+        for quad in corners[_visible(corners, clip, 0)].tolist():
+            polygon(surface, color, quad)
+    ends = pos[connections]
+    line = pygame.draw.line
+    for start, end in ends[_visible(ends, clip, width)].tolist():
+        line(surface, color, start, end, width)
+
+
+def _grid_arrays(
+    cols: int,
+    rows: int,
+    spacing: float,
+    pin: Union[str, Sequence[Tuple[int, int]]],
+    pos: CoordsType,
+    shear: bool,
+    bend: bool,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # the points, locked mask, connections, lengths, colors and quads of a grid,
+    # the colors are known from the layout (like a checkerboard for every kind of connection)
+    # so they dont have to be found with _color_connections
+    index = np.arange(rows * cols).reshape((rows, cols))
+    ys, xs = np.mgrid[0:rows, 0:cols]
+    points = np.stack((pos[0] + xs.ravel() * spacing, pos[1] + ys.ravel() * spacing), axis=1)
+    points = points.astype(np.float64)
+
+    locked = np.zeros(rows * cols, dtype=np.bool_)
+    if isinstance(pin, str):
+        if pin == "top":
+            locked[index[0]] = True
+        elif pin == "corners":
+            locked[[index[0, 0], index[0, -1]]] = True
+        else:
+            raise ValueError(f"unsupported pin '{pin}', expected 'top', 'corners' or a list of (col, row)")
+    else:
+        for col, row in pin:
+            locked[index[row, col]] = True
+
+    # (first points, second points, length, colors) for every kind of connection
+    kinds = [
+        (index[:, :-1], index[:, 1:], spacing, xs[:, :-1] % 2),  # structural
+        (index[:-1, :], index[1:, :], spacing, ys[:-1, :] % 2),
+    ]
+    if shear:
+        diagonal = spacing * math.sqrt(2)
+        kinds.append((index[:-1, :-1], index[1:, 1:], diagonal, xs[:-1, :-1] % 2))
+        kinds.append((index[:-1, 1:], index[1:, :-1], diagonal, xs[:-1, 1:] % 2))
+    if bend:
+        kinds.append((index[:, :-2], index[:, 2:], spacing * 2, xs[:, :-2] // 2 % 2))
+        kinds.append((index[:-2, :], index[2:, :], spacing * 2, ys[:-2, :] // 2 % 2))
+    connections = np.concatenate(
+        [np.stack((a.ravel(), b.ravel()), axis=1) for a, b, _, _ in kinds]
+    ).astype(np.int64)
+    lengths = np.concatenate(
+        [np.full(a.size, length, dtype=np.float64) for a, _, length, _ in kinds]
+    )
+    colors = np.concatenate(
+        [color.ravel() + 2 * i for i, (_, _, _, color) in enumerate(kinds)]
+    ).astype(np.int64)
+    quads = np.stack(
+        (
+            index[:-1, :-1].ravel(),
+            index[:-1, 1:].ravel(),
+            index[1:, 1:].ravel(),
+            index[1:, :-1].ravel(),
+        ),
+        axis=1,
+    ).astype(np.int64)
+    return points, locked, connections, lengths, colors, quads
 
 
 class Cloth:
@@ -46,6 +274,8 @@ class Cloth:
         the y position of the cloth
     data: Dict[str, list]
         the information that the cloth is going to be generated in
+    tear: Optional[float]
+        a connection breaks when it is stretched more than tear times its length (None for no tearing)
 
     Methods:
     -----------
@@ -59,12 +289,17 @@ class Cloth:
         it moves the locked points by a given offset
     offset_all(pos):
         it moves all of the points by a given offset
-    draw(pygame.surface.Surface, color, filled=False, width=2):
+    collide(rects, circles):
+        it pushes the points out of rects and circles
+    draw(pygame.surface.Surface, color, filled=False, width=2, lag=0):
         it draws the cloth
+    grid(cols, rows, spacing, pin="top", pos=(0, 0), shear=True, bend=True, gravity=0.2, tear=None):
+        it creates a rectangular cloth
     """
 
-    def __init__(self, data: Dict[str, list]):
+    def __init__(self, data: Dict[str, list], tear: Optional[float] = None):
         self._data: dict = data.copy()
+        self.tear: Optional[float] = tear
 
         self.points: List[Point] = Point.load_list(data["points"])
         if not any([p.locked for p in self.points]):
@@ -73,6 +308,20 @@ class Cloth:
             Connection(self.points[cn[0]], self.points[cn[1]], cn[2])
             for cn in data["connections"]
         ]
+        self._grid: Optional[RectGrid] = None
+        self._quads: Optional[Tuple[np.ndarray, np.ndarray, int]] = None
+        # the point indexes of every connection for drawing, torn connections are removed from it
+        # the same way as from the connections so it is only built again if connections are added
+        self._indexes: Optional[np.ndarray] = None
+
+    def _connection_indexes(self) -> np.ndarray:
+        if self._indexes is None or self._indexes.shape[0] != len(self.connections):
+            indexes = {id(point): i for i, point in enumerate(self.points)}
+            self._indexes = np.array(
+                [(indexes[id(con.pointA)], indexes[id(con.pointB)]) for con in self.connections],
+                dtype=np.int64,
+            ).reshape((-1, 2))
+        return self._indexes
 
     def update(self, dt: Union[int, float] = 1) -> None:
         """
@@ -85,33 +334,47 @@ class Cloth:
         for _ in range(10):
             for con in self.connections:
                 con.update(dt)
+        if self.tear is not None:
+            self._tear()
 
-    def collide(self, rects: List[pygame.Rect]) -> None:
-        raise NotImplemented("collide method for cloth object is not implemented yet.")
-        rects = [pygame.Rect(r) for r in rects]
-        for point in self.points:
-            for rect in rects:
-                r = pygame.Rect(rect.x + 1, rect.y + 1, rect.w - 2, rect.h - 2)
-                if point.locked or not r.collidepoint(*point.pos):
-                    continue
-                dx = point.pos.x - point.prev_pos.x
-                dy = point.pos.y - point.prev_pos.y
-                if dx:
-                    if dx > 0:  # right
-                        point.pos.x = rect.left
-                        point.prev_pos.x = point.pos.x + dx
-                    else:  # left
-                        point.pos.x = rect.right
-                        point.prev_pos.x = point.pos.x + dx
-                if dy:
-                    if dy > 0:  # down
-                        point.pos.y = rect.top
-                        point.prev_pos.y = point.pos.y + dy
-                    else:  # up
-                        point.pos.y = rect.bottom
-                        point.prev_pos.y = point.pos.y + dy
-                break
-        del rects
+    def _tear(self) -> None:
+        # the stretched connections are swapped with the last one and popped, going from the end
+        # to the start means that the connection that takes the place of a torn one was already checked
+        connections = self.connections
+        indexes = self._indexes
+        if indexes is not None and indexes.shape[0] != len(connections):
+            indexes = self._indexes = None
+        tear = self.tear
+        for i in range(len(connections) - 1, -1, -1):
+            con = connections[i]
+            dx = con.pointB.pos.x - con.pointA.pos.x
+            dy = con.pointB.pos.y - con.pointA.pos.y
+            if dx * dx + dy * dy > (con.length * tear) ** 2:
+                connections[i] = connections[-1]
+                connections.pop()
+                if indexes is not None:
+                    indexes[i] = indexes[len(connections)]
+        if indexes is not None:
+            self._indexes = indexes[: len(connections)]
+
+    def collide(
+        self,
+        rects: Sequence[RectType] = (),
+        circles: Sequence[Tuple[CoordsType, float]] = (),
+    ) -> None:
+        """
+        it pushes the points that are inside of a rect or a circle to the closest edge (the locked points are not moved)
+        :param rects: Sequence[RectType]
+        :param circles: Sequence[Tuple[CoordsType, float]] (center, radius)
+        :return: None
+        """
+        points = [point for point in self.points if not point.locked]
+        if not points or not (rects or circles):
+            return
+        self._grid, circles = _colliders(self._grid, rects, circles)
+        pos = np.array([(point.pos.x, point.pos.y) for point in points], dtype=np.float64)
+        for i in _push_out(pos, self._grid, circles).tolist():
+            points[i].pos.update(pos[i, 0], pos[i, 1])
 
     def borders(self, W: int, H: int) -> None:
         """
@@ -227,17 +490,694 @@ class Cloth:
         color: ColorType,
         filled: bool = False,
         width: int = 2,
+        lag: float = 0,
     ):
-        for con in self.connections:
-            pygame.draw.line(surface, color, con.pointA.pos, con.pointB.pos, width)
+        """
+        it draws the connections that can be seen in the clip area of the surface
+        :param surface: pygame.surface.Surface
+        :param color: ColorType
+        :param filled: if the quads between the points are going to be filled
+        :param width: the width of the lines
+        :param lag: how far back in time the points are drawn with their velocities (FixedTimestep.lag)
+        :return: None
+        """
+        pos = np.fromiter(
+            itertools.chain.from_iterable(point.pos for point in self.points),
+            dtype=np.float64,
+            count=len(self.points) * 2,
+        ).reshape((-1, 2))
+        if lag:
+            prev_pos = np.array(
+                [(point.prev_pos.x, point.prev_pos.y, point.prev_dt) for point in self.points],
+                dtype=np.float64,
+            ).reshape((-1, 3))
+            pos -= (pos - prev_pos[:, :2]) * (lag / prev_pos[:, 2:])
+        connections = self._connection_indexes()
+        quads = None
+        if filled:
+            self._quads = _cached_quads(self._quads, pos, connections)
+            quads = self._quads[0]
+        _draw_cloth(surface, color, pos, connections, quads, width)
 
     @staticmethod
     def load(data: List[Dict[str, list]]) -> "Cloth":
         return Cloth(*data)
 
+    @staticmethod
+    def grid(
+        cols: int,
+        rows: int,
+        spacing: float,
+        pin: Union[str, Sequence[Tuple[int, int]]] = "top",
+        pos: CoordsType = (0, 0),
+        shear: bool = True,
+        bend: bool = True,
+        gravity: float = 0.2,
+        tear: Optional[float] = None,
+    ) -> "Cloth":
+        """
+        it creates a rectangular cloth with structural connections and optionally shear (diagonal) and bend (every second point) connections
+        :param cols: how many points there are in every row
+        :param rows: how many points there are in every column
+        :param spacing: the distance between two points
+        :param pin: "top" (the first row), "corners" (the top corners) or a list of (col, row) of the locked points
+        :param pos: the position of the top left point
+        :param shear: if the diagonal connections are added
+        :param bend: if the connections between every second point are added
+        :param gravity: the gravity of the points
+        :param tear: a connection breaks when it is stretched more than tear times its length
+        :return: Cloth
+        """
+        points, locked, connections, lengths, _, quads = _grid_arrays(
+            cols, rows, spacing, pin, pos, shear, bend
+        )
+        cloth = Cloth(
+            {
+                "points": [
+                    [x, y, lock, gravity]
+                    for (x, y), lock in zip(points.tolist(), locked.tolist())
+                ],
+                "connections": [
+                    [a, b, length]
+                    for (a, b), length in zip(connections.tolist(), lengths.tolist())
+                ],
+            },
+            tear,
+        )
+        cloth._quads = _cached_quads(None, points, connections, quads)
+        cloth._indexes = connections
+        return cloth
+
+    @staticmethod
+    def load_binary(path: PathType, tear: Optional[float] = None) -> "Cloth":
+        """
+        it loads a cloth from a binary cloth file
+        :param path: the path of the file
+        :param tear: a connection breaks when it is stretched more than tear times its length
+        :return: Cloth
+        """
+        data = read_cloth_binary(path)
+        points = [
+            [x, y, locked, gravity]
+            for (x, y), locked, gravity in zip(
+                data["points"].tolist(), data["locked"].tolist(), data["gravity"].tolist()
+            )
+        ]
+        connections = [
+            [a, b, length]
+            for (a, b), length in zip(data["connections"].tolist(), data["lengths"].tolist())
+        ]
+        return Cloth({"points": points, "connections": connections}, tear)
+
+    @staticmethod
+    def save_binary(cloth: "Cloth", path: PathType) -> None:
+        """
+        it saves the current state of a cloth to a binary cloth file
+        :param cloth: Cloth
+        :param path: the path of the file
+        :return: None
+        """
+        indexes = {id(point): i for i, point in enumerate(cloth.points)}
+        write_cloth_binary(
+            path,
+            [(point.pos.x, point.pos.y) for point in cloth.points],
+            [point.locked for point in cloth.points],
+            [point.gravity for point in cloth.points],
+            [(indexes[id(con.pointA)], indexes[id(con.pointB)]) for con in cloth.connections],
+            [con.length for con in cloth.connections],
+        )
+
     @staticmethod
     def save(cloth: "Cloth") -> List[Dict[str, list]]:
-        return [cloth._data]
+        indexes = {id(point): i for i, point in enumerate(cloth.points)}
+        return [
+            {
+                "points": [Point.save(point) for point in cloth.points],
+                "connections": [Connection.save(con, indexes) for con in cloth.connections],
+            }
+        ]
+
+
+def _color_connections(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    # a greedy edge coloring, no two connections with the same color share a point
+    used: Dict[int, int] = {}
+    colors = np.empty(len(a), dtype=np.int64)
+    for i, (p, q) in enumerate(zip(a.tolist(), b.tolist())):
+        mask = used.get(p, 0) | used.get(q, 0)
+        color = (~mask & (mask + 1)).bit_length() - 1  # the lowest free color
+        colors[i] = color
+        used[p] = used.get(p, 0) | (1 << color)
+        used[q] = used.get(q, 0) | (1 << color)
+    return colors
+
+
+# fastmath is turned off so the results are the same as Connection.update
+@nbu.njit(fastmath=False, inline="always")
+def _relax_connection(
+    pos: nbu.Array(float, 2),
+    a: int,
+    b: int,
+    length: float,
+    move: nbu.Array(float, 1),
+    dt: float,
+) -> None:
+    # Connection.update for a single connection
+    dx = pos[b, 0] - pos[a, 0]
+    dy = pos[b, 1] - pos[a, 1]
+    distance = math.sqrt(dx * dx + dy * dy)
+    if distance == 0:
+        return
+    percent = (length - distance) / distance / 2
+    offset_x = dx * percent * dt
+    offset_y = dy * percent * dt
+    pos[a, 0] -= offset_x * move[a]
+    pos[a, 1] -= offset_y * move[a]
+    pos[b, 0] += offset_x * move[b]
+    pos[b, 1] += offset_y * move[b]
+
+
+@nbu.njit(fastmath=False)
+def _relax_gauss_seidel(
+    pos: nbu.Array(float, 2),
+    connections: nbu.Array(int, 2),
+    lengths: nbu.Array(float, 1),
+    move: nbu.Array(float, 1),
+    iterations: int,
+    dt: float,
+) -> None:
+    # the connections one after the other in their order, like Cloth.update
+    for _ in range(iterations):
+        for i in range(connections.shape[0]):
+            _relax_connection(
+                pos, connections[i, 0], connections[i, 1], lengths[i], move, dt
+            )
+
+
+@nbu.njit(fastmath=False, parallel=True)
+def _relax_colored(
+    pos: nbu.Array(float, 2),
+    connections: nbu.Array(int, 2),
+    lengths: nbu.Array(float, 1),
+    move: nbu.Array(float, 1),
+    starts: nbu.Array(int, 1),
+    ends: nbu.Array(int, 1),
+    iterations: int,
+    dt: float,
+) -> None:
+    # the connections are sorted by their color and the connections of a color
+    # dont share any points so they are relaxed in parallel
+    for _ in range(iterations):
+        for color in range(starts.shape[0]):
+            for i in nbu.prange(starts[color], ends[color]):
+                _relax_connection(
+                    pos, connections[i, 0], connections[i, 1], lengths[i], move, dt
+                )
+
+
+class ClothArray:
+    """
+    Creates a cloth object that keeps its points and connections in numpy arrays
+
+    Parameters:
+    -----------
+    data: Dict[str, list]
+        the information that the cloth is going to be generated in (the same format as Cloth)
+    iterations: int
+        how many times the connections are relaxed in every update
+    solver: str
+        "colored" relaxes the connections that dont share points at once (in parallel with numba),
+        "gauss_seidel" relaxes them one after the other in their order like Cloth (only with numba)
+    tear: Optional[float]
+        a connection breaks when it is stretched more than tear times its length (None for no tearing)
+
+    Methods:
+    -----------
+    from_arrays(points, connections, locked, lengths=None, gravity=0.2, iterations=10, solver="colored", tear=None):
+        it creates a cloth straight from numpy arrays
+    grid(cols, rows, spacing, pin="top", pos=(0, 0), shear=True, bend=True, ...):
+        it creates a rectangular cloth
+    update(dt=1):
+        it updates the cloth
+    borders(W, H):
+        it keeps the points inside an area
+    move_locked(pos):
+        it moves the locked points in a given position (they keep their offsets)
+    move_all(pos):
+        it moves all of the points in a given position (they keep their offsets)
+    offset_locked(pos):
+        it moves the locked points by a given offset
+    offset_all(pos):
+        it moves all of the points by a given offset
+    collide(rects, circles):
+        it pushes the points out of rects and circles
+    draw(pygame.surface.Surface, color, filled=False, width=2, lag=0):
+        it draws the cloth
+    """
+
+    def __init__(
+        self,
+        data: Dict[str, list],
+        iterations: int = 10,
+        solver: str = "colored",
+        tear: Optional[float] = None,
+    ):
+        points = data["points"]
+        connections = data["connections"]
+        self._setup(
+            np.array([p[:2] for p in points], dtype=np.float64).reshape(-1, 2),
+            np.array([cn[:2] for cn in connections], dtype=np.int64).reshape(-1, 2),
+            np.array([p[2] for p in points], dtype=np.bool_),
+            np.array([cn[2] for cn in connections], dtype=np.float64),
+            np.array([p[3] if len(p) > 3 else 0.2 for p in points], dtype=np.float64),
+            iterations,
+            solver,
+            tear,
+        )
+
+    @staticmethod
+    def from_arrays(
+        points: np.ndarray,
+        connections: np.ndarray,
+        locked: np.ndarray,
+        lengths: Optional[np.ndarray] = None,
+        gravity: Union[float, np.ndarray] = 0.2,
+        iterations: int = 10,
+        solver: str = "colored",
+        tear: Optional[float] = None,
+    ) -> "ClothArray":
+        """
+        it creates a cloth from arrays
+        :param points: an (N, 2) array with the positions of the points
+        :param connections: an (M, 2) array with the indexes of the points of every connection
+        :param locked: an (N,) bool array
+        :param lengths: an (M,) array with the length of every connection (by default the current distances)
+        :param gravity: the gravity of every point
+        :param iterations: how many times the connections are relaxed in every update
+        :param solver: "colored" or "gauss_seidel"
+        :param tear: a connection breaks when it is stretched more than tear times its length
+        :return: ClothArray
+        """
+        points = np.array(points, dtype=np.float64).reshape(-1, 2)
+        connections = np.array(connections, dtype=np.int64).reshape(-1, 2)
+        if lengths is None:
+            d = points[connections[:, 1]] - points[connections[:, 0]]
+            lengths = np.hypot(d[:, 0], d[:, 1])
+        cloth = ClothArray.__new__(ClothArray)
+        cloth._setup(
+            points,
+            connections,
+            np.array(locked, dtype=np.bool_).reshape(-1),
+            np.array(lengths, dtype=np.float64).reshape(-1),
+            np.broadcast_to(np.asarray(gravity, dtype=np.float64), len(points)).copy(),
+            iterations,
+            solver,
+            tear,
+        )
+        return cloth
+
+    def _setup(
+        self,
+        points: np.ndarray,
+        connections: np.ndarray,
+        locked: np.ndarray,
+        lengths: np.ndarray,
+        gravity: np.ndarray,
+        iterations: int,
+        solver: str,
+        tear: Optional[float],
+        colors: Optional[np.ndarray] = None,
+    ) -> None:
+        if solver not in ("colored", "gauss_seidel"):
+            raise ValueError(
+                f"unsupported solver '{solver}', expected 'colored' or 'gauss_seidel'"
+            )
+        if not locked.any():
+            raise NoLockedPoints("the given cloth has no locked points")
+        self.pos: np.ndarray = points
+        self.prev_pos: np.ndarray = points.copy()
+        self.locked: np.ndarray = locked
+        self.gravity: np.ndarray = gravity
+        self.friction: float = 0.999
+        self.iterations: int = iterations
+        self.solver: str = solver
+        self.tear: Optional[float] = tear
+        self._grid: Optional[RectGrid] = None
+        self._quads: Optional[Tuple[np.ndarray, np.ndarray, int]] = None
+        self._prev_dt: Union[int, float] = 1
+        self.connections: np.ndarray = connections
+        self.lengths: np.ndarray = lengths
+        self._build_batches(colors)
+
+    def _build_batches(self, colors: Optional[np.ndarray] = None) -> None:
+        # the color of every connection (they can come from a file), it stays valid when connections are removed
+        if colors is None or colors.shape[0] != self.connections.shape[0]:
+            colors = _color_connections(self.connections[:, 0], self.connections[:, 1])
+        self._colors: np.ndarray = colors
+        self._sort_batches()
+
+    def _sort_batches(self) -> None:
+        # a copy of the connections sorted by their color so every color can be relaxed at once,
+        # the connections of a color are from its start to its end (the end goes down when they are torn)
+        colors = self._colors
+        order = np.argsort(colors, kind="stable")
+        self._colored_connections: np.ndarray = self.connections[order]
+        self._colored_lengths: np.ndarray = self.lengths[order]
+        bounds = np.searchsorted(colors[order], np.arange(int(colors.max(initial=-1)) + 2))
+        self._starts: np.ndarray = bounds[:-1].copy()
+        self._ends: np.ndarray = bounds[1:].copy()
+        # the place of every connection in the sorted copy and the connection of every place
+        self._colored_owners: np.ndarray = order
+        self._colored_places: np.ndarray = np.empty_like(order)
+        self._colored_places[order] = np.arange(order.shape[0])
+        self._move: np.ndarray = (~self.locked).astype(np.float64)
+        # the data of every color for the numpy relaxation
+        self._batches: List[Tuple[np.ndarray, ...]] = []
+        if not nbu.USE_NUMBA:
+            self._batches = [self._batch(color) for color in range(self._starts.shape[0])]
+
+    def _batch(self, color: int) -> Tuple[np.ndarray, ...]:
+        start, end = self._starts[color], self._ends[color]
+        a = self._colored_connections[start:end, 0]
+        b = self._colored_connections[start:end, 1]
+        move = self._move[:, None]
+        return a, b, self._colored_lengths[start:end], move[a], move[b]
+
+    def update(self, dt: Union[int, float] = 1) -> None:
+        """
+        it moves the points
+        :param dt: Union[int, float]
+        :return: None
+        """
+        pos = self.pos
+        free = ~self.locked
+        # time corrected verlet, with the same dt every time it is the usual verlet
+        velocity = (pos[free] - self.prev_pos[free]) * (
+            self.friction ** dt * dt / self._prev_dt
+        )
+        velocity[:, 1] += self.gravity[free] * dt * dt
+        self.prev_pos[free] = pos[free]
+        pos[free] += velocity
+        self._prev_dt = dt
+        self._relax(dt)
+        if self.tear is not None:
+            self._tear()
+
+    def _relax(self, dt: Union[int, float]) -> None:
+        pos = self.pos
+        if nbu.USE_NUMBA:
+            if self.solver == "gauss_seidel":
+                _relax_gauss_seidel(
+                    pos, self.connections, self.lengths, self._move, self.iterations, dt
+                )
+            else:
+                _relax_colored(
+                    pos,
+                    self._colored_connections,
+                    self._colored_lengths,
+                    self._move,
+                    self._starts,
+                    self._ends,
+                    self.iterations,
+                    dt,
+                )
+            return
+        for _ in range(self.iterations):
+            for a, b, lengths, move_a, move_b in self._batches:
+                d = pos[b] - pos[a]
+                distance = np.hypot(d[:, 0], d[:, 1])
+                percent = np.divide(
+                    lengths - distance,
+                    distance * 2,
+                    out=np.zeros_like(distance),
+                    where=distance > 0,
+                )
+                d *= (percent * dt)[:, None]
+                pos[a] -= d * move_a
+                pos[b] += d * move_b
+
+    def _tear(self) -> None:
+        # the stretched connections are swapped with the last one (the point indexes never change),
+        # going from the end to the start means that the connection that takes the place of a torn one is kept
+        connections, lengths, colors = self.connections, self.lengths, self._colors
+        d = self.pos[connections[:, 1]] - self.pos[connections[:, 0]]
+        torn = np.flatnonzero(np.hypot(d[:, 0], d[:, 1]) > lengths * self.tear)
+        if not torn.size:
+            return
+        colored, colored_lengths = self._colored_connections, self._colored_lengths
+        owners, places, ends = self._colored_owners, self._colored_places, self._ends
+        last = connections.shape[0]
+        torn_colors = set()
+        for i in torn[::-1].tolist():
+            # in the sorted copy the last connection of the same color takes its place
+            color = colors[i]
+            torn_colors.add(color)
+            place = places[i]
+            ends[color] -= 1
+            end = ends[color]
+            colored[place] = colored[end]
+            colored_lengths[place] = colored_lengths[end]
+            owners[place] = owners[end]
+            places[owners[place]] = place
+            last -= 1
+            if i == last:
+                continue
+            connections[i] = connections[last]
+            lengths[i] = lengths[last]
+            colors[i] = colors[last]
+            places[i] = places[last]
+            owners[places[i]] = i
+        self.connections = connections[:last]
+        self.lengths = lengths[:last]
+        self._colors = colors[:last]
+        if self._batches:
+            for color in torn_colors:
+                self._batches[color] = self._batch(color)
+
+    def borders(self, W: int, H: int) -> None:
+        """
+        it keeps the points inside an area
+        :param W: the width of the area
+        :param H: the height of the area
+        :return: None
+        """
+        pos, prev = self.pos, self.prev_pos
+        d = pos - prev
+        for axis, limit in ((0, W), (1, H)):
+            column = pos[:, axis]
+            over = column > limit
+            under = column < 0
+            column[over] = limit
+            column[under] = 0
+            hit = over | under
+            prev[hit, axis] = column[hit] + d[hit, axis]
+
+    def collide(
+        self,
+        rects: Sequence[RectType] = (),
+        circles: Sequence[Tuple[CoordsType, float]] = (),
+    ) -> None:
+        """
+        it pushes the points that are inside of a rect or a circle to the closest edge (the locked points are not moved)
+        :param rects: Sequence[RectType]
+        :param circles: Sequence[Tuple[CoordsType, float]] (center, radius)
+        :return: None
+        """
+        if not (rects or circles):
+            return
+        self._grid, circles = _colliders(self._grid, rects, circles)
+        free = np.flatnonzero(~self.locked)
+        pos = self.pos[free]
+        moved = _push_out(pos, self._grid, circles)
+        self.pos[free[moved]] = pos[moved]
+
+    def _difference(self, pos: CoordsType) -> np.ndarray:
+        # from the top left corner of the locked points to a position
+        locked = self.pos[self.locked]
+        corner = locked.min(axis=0) if len(locked) else np.zeros(2)
+        return np.array([pos[0], pos[1]], dtype=np.float64) - corner
+
+    def move_locked(self, pos: CoordsType) -> None:
+        """
+        it moves all of the locked locations the velocities of the "free" points are going to change
+        :param pos: CoordsType
+        :return: None
+        """
+        self.offset_locked(self._difference(pos))
+
+    def move_all(self, pos: CoordsType) -> None:
+        """
+        it moves the cloth with a given offset the velocities are the same they are not effected
+        :param pos: CoordsType
+        :return: None
+        """
+        self.offset_all(self._difference(pos))
+
+    def offset_locked(self, offset: CoordsType) -> None:
+        """
+        it moves all of the locked points in a cloth by a given amount velocities will not be effected
+        :param offset: CoordsType
+        :return: None
+        """
+        offset = np.array([offset[0], offset[1]], dtype=np.float64)
+        self.pos[self.locked] += offset
+        self.prev_pos[self.locked] += offset
+
+    def offset_all(self, offset: CoordsType) -> None:
+        """
+        it moves all of the points in a cloth by a given amount velocities will not be effected
+        :param offset: CoordsType
+        :return: None
+        """
+        offset = np.array([offset[0], offset[1]], dtype=np.float64)
+        self.pos += offset
+        self.prev_pos += offset
+
+    def draw(
+        self,
+        surface: pygame.surface.Surface,
+        color: ColorType,
+        filled: bool = False,
+        width: int = 2,
+        lag: float = 0,
+    ):
+        """
+        it draws the connections that can be seen in the clip area of the surface
+        :param surface: pygame.surface.Surface
+        :param color: ColorType
+        :param filled: if the quads between the points are going to be filled
+        :param width: the width of the lines
+        :param lag: how far back in time the points are drawn with their velocities (FixedTimestep.lag)
+        :return: None
+        """
+        pos = self.pos
+        if lag:
+            pos = pos - (pos - self.prev_pos) * (lag / self._prev_dt)
+        quads = None
+        if filled:
+            self._quads = _cached_quads(self._quads, pos, self.connections)
+            quads = self._quads[0]
+        _draw_cloth(surface, color, pos, self.connections, quads, width)
+
+    @staticmethod
+    def load(data: List[Dict[str, list]]) -> "ClothArray":
+        return ClothArray(*data)
+
+    @staticmethod
+    def grid(
+        cols: int,
+        rows: int,
+        spacing: float,
+        pin: Union[str, Sequence[Tuple[int, int]]] = "top",
+        pos: CoordsType = (0, 0),
+        shear: bool = True,
+        bend: bool = True,
+        gravity: Union[float, np.ndarray] = 0.2,
+        iterations: int = 10,
+        solver: str = "colored",
+        tear: Optional[float] = None,
+    ) -> "ClothArray":
+        """
+        it creates a rectangular cloth with structural connections and optionally shear (diagonal) and bend (every second point) connections,
+        the arrays are made directly so it is fast enough for very big cloths
+        :param cols: how many points there are in every row
+        :param rows: how many points there are in every column
+        :param spacing: the distance between two points
+        :param pin: "top" (the first row), "corners" (the top corners) or a list of (col, row) of the locked points
+        :param pos: the position of the top left point
+        :param shear: if the diagonal connections are added
+        :param bend: if the connections between every second point are added
+        :param gravity: the gravity of the points
+        :param iterations: how many times the connections are relaxed in every update
+        :param solver: "colored" or "gauss_seidel"
+        :param tear: a connection breaks when it is stretched more than tear times its length
+        :return: ClothArray
+        """
+        points, locked, connections, lengths, colors, quads = _grid_arrays(
+            cols, rows, spacing, pin, pos, shear, bend
+        )
+        cloth = ClothArray.__new__(ClothArray)
+        cloth._setup(
+            points,
+            connections,
+            locked,
+            lengths,
+            np.broadcast_to(np.asarray(gravity, dtype=np.float64), len(points)).copy(),
+            iterations,
+            solver,
+            tear,
+            colors,
+        )
+        cloth._quads = _cached_quads(None, points, connections, quads)
+        return cloth
+
+    @staticmethod
+    def load_binary(
+        path: PathType,
+        iterations: int = 10,
+        solver: str = "colored",
+        tear: Optional[float] = None,
+    ) -> "ClothArray":
+        """
+        it loads a cloth from a binary cloth file (the arrays are used as they are)
+        :param path: the path of the file
+        :param iterations: how many times the connections are relaxed in every update
+        :param solver: "colored" or "gauss_seidel"
+        :param tear: a connection breaks when it is stretched more than tear times its length
+        :return: ClothArray
+        """
+        data = read_cloth_binary(path)
+        cloth = ClothArray.__new__(ClothArray)
+        cloth._setup(
+            data["points"],
+            data["connections"],
+            data["locked"],
+            data["lengths"],
+            data["gravity"],
+            iterations,
+            solver,
+            tear,
+            data.get("colors"),
+        )
+        return cloth
+
+    @staticmethod
+    def save_binary(cloth: "ClothArray", path: PathType) -> None:
+        """
+        it saves the current state of a cloth to a binary cloth file
+        :param cloth: ClothArray
+        :param path: the path of the file
+        :return: None
+        """
+        write_cloth_binary(
+            path,
+            cloth.pos,
+            cloth.locked,
+            cloth.gravity,
+            cloth.connections,
+            cloth.lengths,
+            cloth._colors,
+        )
+
+    @staticmethod
+    def save(cloth: "ClothArray") -> List[Dict[str, list]]:
+        points = [
+            [x, y, locked, gravity]
+            for (x, y), locked, gravity in zip(
+                cloth.pos.tolist(), cloth.locked.tolist(), cloth.gravity.tolist()
+            )
+        ]
+        connections = [
+            [a, b, length]
+            for (a, b), length in zip(cloth.connections.tolist(), cloth.lengths.tolist())
+        ]
+        return [{"points": points, "connections": connections}]
+
+
+def build_cloth_numba() -> None:
+    cloth = ClothArray.from_arrays([[0, 0], [0, 5]], [[0, 1]], [True, False])
+    cloth.update()
+    cloth.solver = "gauss_seidel"
+    cloth.update()
 
 
 class Point:
@@ -247,14 +1187,19 @@ class Point:
         self.pos: pygame.math.Vector2 = pygame.math.Vector2(x, y)
         self.prev_pos: pygame.math.Vector2 = pygame.math.Vector2(x, y)
         self.friction: Union[int, float] = 0.999
+        # the dt of the last update, the velocity is the distance from the previous position over it
+        self.prev_dt: Union[int, float] = 1
 
     def update(self, dt: Union[int, float] = 1) -> None:
         if not self.locked:
-            dx = (self.pos.x - self.prev_pos.x) * self.friction
-            dy = (self.pos.y - self.prev_pos.y) * self.friction
+            # time corrected verlet, with the same dt every time it is the usual verlet
+            scale = self.friction ** dt * dt / self.prev_dt
+            dx = (self.pos.x - self.prev_pos.x) * scale
+            dy = (self.pos.y - self.prev_pos.y) * scale
             self.prev_pos.x, self.prev_pos.y = self.pos.x, self.pos.y
-            self.pos.x += dx * dt
-            self.pos.y += (dy + self.gravity) * dt
+            self.pos.x += dx
+            self.pos.y += dy + self.gravity * dt * dt
+        self.prev_dt = dt
 
     @staticmethod
     def save(
@@ -299,8 +1244,11 @@ class Connection:
 
     @staticmethod
     def save(
-        con: "Connection", points: List[Point]
+        con: "Connection", points: Union[List[Point], Dict[int, int]]
     ) -> List[Union[int, int, Union[int, float]]]:
+        # the points can also be a dict from the id of every point to its index so it doesnt have to be searched
+        if isinstance(points, dict):
+            return [points[id(con.pointA)], points[id(con.pointB)], con.length]
         return [points.index(con.pointA), points.index(con.pointB), con.length]
 
     @staticmethod
@@ -26,7 +26,7 @@ managers for some of the classes
 """
 
 
-from typing import Tuple, List, Iterable
+from typing import Tuple, List, Iterable, Optional, Union
 
 import pygame
 
@@ -35,8 +35,15 @@ from PygameHaze.constants import *
 from PygameHaze.Classes import Button
 from PygameHaze.Classes import InputField, InputFieldNumbers, InputFieldLetters
 from PygameHaze.Classes import Particle
+from PygameHaze.Classes import ParticleArray
+from PygameHaze.Classes.particle import ValuesType
+from PygameHaze.Classes.particle import BROADPHASE_MIN_RECTS
+from PygameHaze.Classes.particle import _circle_sprite
+from PygameHaze.utils.spatial import RectGrid
 from PygameHaze.Classes import Animation
 
+import numpy as np
+
 
 class _BaseManager:
     """
@@ -137,29 +144,96 @@ class ParticleManager(_BaseManager):
     """
     Creates a storage for the particles with more functions
 
+    Parameters:
+    -----------
+    vectorized: bool
+        if True the particles are stored in a ParticleArray and are updated all together with numpy
+        (iterating over the manager gives copies of the particles as Particle objects)
+    capacity: int
+        the starting capacity of the ParticleArray (only used when vectorized)
+
     Methods:
     -----------
-    draw(pygame.surface.Surface):
-        it draws the particles on the screen
+    draw(pygame.surface.Surface, batched=False, lag=0):
+        it draws the particles on the screen (with Surface.blits when batched), lag draws them back in time (FixedTimestep.lag)
     update(dt: float=1, rects=[]):
         it shrinks, apply gravity, move and collide with rects
     get_particles():
         it returns a list of the particles
     add_particle(x, y, vel_x, vel_y, shrink_amount, size, color, collision_tolerance, gravity):
         it adds a new particle
+    emit(n, x, y, vel_x, vel_y, shrink_amount, size, color, collision_tolerance, gravity):
+        it adds n particles at once, every value can be a number, a (low, high) range or an array
     """
 
-    def __init__(self):
+    def __init__(self, vectorized: bool = False, capacity: int = 1024):
         self.__items: List[Particle] = []
+        self.__array: Optional[ParticleArray] = (
+            ParticleArray(capacity) if vectorized else None
+        )
+        self.__grid: Optional[RectGrid] = None
+
+    @property
+    def vectorized(self) -> bool:
+        return self.__array is not None
 
-    def draw(self, surface: pygame.surface.Surface) -> None:
-        [particle.draw(surface) for particle in self.__items]
+    @property
+    def array(self) -> Optional[ParticleArray]:
+        return self.__array
 
-    def update(self, dt: float = 1, rects: list[pygame.Rect] = []) -> None:
-        [particle.update(dt, rects) for particle in self.__items]
+    def draw(
+        self, surface: pygame.surface.Surface, batched: bool = False, lag: float = 0
+    ) -> None:
+        if self.__array is not None:
+            self.__array.draw(surface, batched, lag)
+            return
+        if not batched:
+            [particle.draw(surface, lag) for particle in self.__items]
+            return
+        sprites = []
+        for particle in self.__items:
+            radius = int(particle.size)
+            if radius > 0:
+                sprites.append(
+                    (
+                        _circle_sprite(radius, tuple(pygame.Color(particle.color))[:3]),
+                        (
+                            particle.rect.x - particle.vel_x * lag - radius,
+                            particle.rect.y - particle.vel_y * lag - radius,
+                        ),
+                    )
+                )
+        surface.blits(sprites, False)
+
+    def update(self, dt: float = 1, rects: List[pygame.Rect] = []) -> None:
+        if self.__array is not None:
+            self.__array.update(dt, rects)
+            return
+        if len(rects) < BROADPHASE_MIN_RECTS:
+            [particle.update(dt, rects) for particle in self.__items]
+        else:
+            # every particle is only tested against the rects that are near it
+            self.__grid = RectGrid.cached(self.__grid, rects)
+            for particle in self.__items:
+                r = particle.rect
+                # the area that the particle can reach in this update
+                reach = (
+                    particle.collision_tolerance
+                    + particle.size * 2
+                    + (abs(particle.vel_x) + abs(particle.vel_y) + abs(particle.gravity))
+                    * dt
+                    * (3 + 3 * dt)
+                    + 1
+                )
+                nearby = self.__grid.query_area(
+                    r.x - reach, r.y - reach, r.x + reach, r.y + reach
+                )
+                particle.update(dt, [rects[i] for i in nearby])
         self.__items = [particle for particle in self.__items if particle.size > 0]
 
     def get_particles(self) -> List[Particle]:
+        if self.__array is not None:
+            return list(self.__array)
         return self.__items
 
     def add_particle(
@@ -174,6 +248,19 @@ class ParticleManager(_BaseManager):
         collision_tolerance: float = 10,
         gravity: float = 0.1,
     ) -> None:
+        if self.__array is not None:
+            self.__array.add(
+                x,
+                y,
+                vel_x,
+                vel_y,
+                shrink_amount,
+                size,
+                color,
+                collision_tolerance,
+                gravity,
+            )
+            return
         self.__items.append(
             Particle(
                 x,
@@ -188,12 +275,63 @@ class ParticleManager(_BaseManager):
             )
         )
 
+    def emit(
+        self,
+        n: int,
+        x: ValuesType,
+        y: ValuesType,
+        vel_x: ValuesType,
+        vel_y: ValuesType,
+        shrink_amount: ValuesType,
+        size: ValuesType = 7,
+        color: Union[ColorType, Tuple[ColorType, ColorType], np.ndarray] = (
+            255,
+            255,
+            255,
+        ),
+        collision_tolerance: ValuesType = 10,
+        gravity: ValuesType = 0.1,
+    ) -> None:
+        """
+        it adds n particles with one call (see ParticleArray.emit), when the manager is vectorized
+        the particles are written in the free slots of the arrays without creating any objects
+        :param n: the amount of particles
+        :type n: int
+        :return: None
+        """
+        args = (
+            x,
+            y,
+            vel_x,
+            vel_y,
+            shrink_amount,
+            size,
+            color,
+            collision_tolerance,
+            gravity,
+        )
+        if self.__array is not None:
+            self.__array.emit(n, *args)
+            return
+        batch = ParticleArray(n)
+        batch.emit(n, *args)
+        self.__items.extend(batch)
+
     def __getitem__(self, item) -> Particle:
+        if self.__array is not None:
+            return self.__array.get(item)
         return self.__items[item]
 
     def __iter__(self) -> Iterable[Particle]:
+        if self.__array is not None:
+            return iter(self.__array)
         return iter(self.__items)
 
+    def __len__(self) -> int:
+        if self.__array is not None:
+            return len(self.__array)
+        return len(self.__items)
+
     def __next__(self) -> Particle:
         try:
             item = self.__items[self.__i]
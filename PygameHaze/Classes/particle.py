@@ -28,7 +28,18 @@ particles
 
 from typing import List
 from typing import Tuple
+from typing import Iterator
+from typing import Union
+from typing import Optional
 
+from PygameHaze.utils.spatial import RectGrid
+import PygameHaze.utils._numba_utils as nbu
+from PygameHaze.types import *
+
+from functools import lru_cache
+from itertools import repeat
+
+import numpy as np
 import pygame
 import random
 
@@ -60,7 +71,7 @@ class Particle:
 
     Methods:
     -----------
-    draw(surface: pygame.surface):
+    draw(surface: pygame.surface, lag=0):
         it draws the particle
     update(dt=1, rects=[]):
         it shrinks, apply gravity, move and collide with rects
@@ -87,8 +98,11 @@ class Particle:
         self.gravity: float = gravity
         self.rect: pygame.Rect = pygame.Rect(x, y, size * 2, size * 2)
 
-    def draw(self, surface: pygame.surface.Surface) -> None:
-        pygame.draw.circle(surface, self.color, self.rect.topleft, self.size)
+    def draw(self, surface: pygame.surface.Surface, lag: float = 0) -> None:
+        x, y = self.rect.topleft
+        pygame.draw.circle(
+            surface, self.color, (x - self.vel_x * lag, y - self.vel_y * lag), self.size
+        )
 
     def update(self, dt: float = 1, rects: List[pygame.Rect] = []) -> None:
         self.size -= self.shrink_amount * dt
@@ -97,6 +111,7 @@ class Particle:
         self.rect.y += self.vel_y * dt
         self.rect = pygame.Rect(self.rect.x, self.rect.y, self.size * 2, self.size * 2)
 
+        # a bounce keeps 0.75 of the speed for any dt and it is pushed out by 2 steps of dt
         for rect in rects:
             rect = rect.copy()
             rect.x -= self.collision_tolerance
@@ -108,25 +123,25 @@ class Particle:
                     abs(rect.top - self.rect.bottom) < self.collision_tolerance
                     and self.vel_y > 0
                 ):
-                    self.vel_y *= (-0.75) * dt
+                    self.vel_y *= -0.75
                     self.rect.y += (self.vel_y * 2) * dt
                 if (
                     abs(rect.bottom - self.rect.top) < self.collision_tolerance
                     and self.vel_y < 0
                 ):
-                    self.vel_y *= (-0.75) * dt
+                    self.vel_y *= -0.75
                     self.rect.y += (self.vel_y * 2) * dt
                 if (
                     abs(rect.right - self.rect.left) < self.collision_tolerance
                     and self.vel_x < 0
                 ):
-                    self.vel_x *= (-0.75) * dt
+                    self.vel_x *= -0.75
                     self.rect.x += (self.vel_x * 2) * dt
                 if (
                     abs(rect.left - self.rect.right) < self.collision_tolerance
                     and self.vel_x > 0
                 ):
-                    self.vel_x *= (-0.75) * dt
+                    self.vel_x *= -0.75
                     self.rect.x += (self.vel_x * 2) * dt
 
     def randomize_vel(
@@ -140,3 +155,618 @@ class Particle:
 
     def __str__(self) -> str:
         return f"particle at: [{self.rect.x}, {self.rect.y}] with size: {self.size} with gravity: {self.gravity}"
+
+
+ValuesType = Union[float, Tuple[float, float], np.ndarray]
+
+
+@lru_cache(maxsize=4096)
+def _circle_sprite(radius: int, color: Tuple[int, int, int]) -> pygame.surface.Surface:
+    """
+    a pre-rendered circle that is used for drawing particles with Surface.blits
+    :param radius: the radius of the circle
+    :param color: the color of the circle
+    :type radius: int
+    :type color: Tuple[int, int, int]
+    :return: pygame.surface.Surface
+    """
+    colorkey = (0, 0, 0) if color != (0, 0, 0) else (255, 255, 255)
+    sprite = pygame.surface.Surface((radius * 2 + 1, radius * 2 + 1))
+    sprite.fill(colorkey)
+    pygame.draw.circle(sprite, color, (radius, radius), radius)
+    sprite.set_colorkey(colorkey, pygame.RLEACCEL)
+    return sprite
+
+
+# fastmath is turned off so the results are the same as Particle.update
+@nbu.njit(fastmath=False)
+def _collide_particles(
+    pos: nbu.Array(float, 2),
+    vel: nbu.Array(float, 2),
+    size: nbu.Array(float, 1),
+    tolerance: nbu.Array(float, 1),
+    edges: nbu.Array(float, 2),
+    starts: nbu.Array(int, 1),
+    items: nbu.Array(int, 1),
+    origin_x: float,
+    origin_y: float,
+    cell_size: float,
+    cols: int,
+    rows: int,
+    dt: float,
+) -> None:
+    # the collision response of Particle.update for every particle, the rects
+    # come from a RectGrid and they are tested in their original order
+    # the restitution doesnt depend on dt so substeps bounce the same way
+    damping = -0.75
+    # the last particle that found each rect so a rect is not added twice
+    seen = np.full(edges.shape[0], -1, dtype=np.int64)
+    found = np.empty(edges.shape[0], dtype=np.int64)
+    for i in range(pos.shape[0]):
+        s = size[i] * 2
+        if s <= 0:
+            continue
+        t = tolerance[i]
+        x = pos[i, 0]
+        y = pos[i, 1]
+        vx = vel[i, 0]
+        vy = vel[i, 1]
+
+        pad = (abs(vx) + abs(vy)) * (3 * dt * dt)
+        x0 = x - t - pad
+        y0 = y - t - pad
+        x1 = x + s + t + pad
+        y1 = y + s + t + pad
+        if (
+            x1 < origin_x
+            or y1 < origin_y
+            or x0 >= origin_x + cols * cell_size
+            or y0 >= origin_y + rows * cell_size
+        ):
+            continue
+        cx0 = min(max(int(np.floor((x0 - origin_x) / cell_size)), 0), cols - 1)
+        cy0 = min(max(int(np.floor((y0 - origin_y) / cell_size)), 0), rows - 1)
+        cx1 = min(max(int(np.floor((x1 - origin_x) / cell_size)), 0), cols - 1)
+        cy1 = min(max(int(np.floor((y1 - origin_y) / cell_size)), 0), rows - 1)
+
+        count = 0
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                cell = cy * cols + cx
+                for k in range(starts[cell], starts[cell + 1]):
+                    j = items[k]
+                    if (
+                        seen[j] != i
+                        and x0 < edges[j, 2]
+                        and edges[j, 0] < x1
+                        and y0 < edges[j, 3]
+                        and edges[j, 1] < y1
+                    ):
+                        seen[j] = i
+                        found[count] = j
+                        count += 1
+        if not count:
+            continue
+        found[:count].sort()
+
+        for k in range(count):
+            j = found[k]
+            # the edges of the rect inflated by the collision tolerance
+            left = edges[j, 0] - t
+            top = edges[j, 1] - t
+            right = edges[j, 2] + t
+            bottom = edges[j, 3] + t
+            if not (x < right and left < x + s and y < bottom and top < y + s):
+                continue
+            if abs(top - (y + s)) < t and vy > 0:
+                vy *= damping
+                y += (vy * 2) * dt
+            if abs(bottom - y) < t and vy < 0:
+                vy *= damping
+                y += (vy * 2) * dt
+            if abs(right - x) < t and vx < 0:
+                vx *= damping
+                x += (vx * 2) * dt
+            if abs(left - (x + s)) < t and vx > 0:
+                vx *= damping
+                x += (vx * 2) * dt
+
+        pos[i, 0] = x
+        pos[i, 1] = y
+        vel[i, 0] = vx
+        vel[i, 1] = vy
+
+
+# with less rects than this it is faster to test every rect
+BROADPHASE_MIN_RECTS: int = 8
+
+
+def _spread(value: ValuesType, n: int, rng: np.random.Generator) -> np.ndarray:
+    # a tuple/list of two numbers is a (low, high) range, an array holds a value per particle
+    if isinstance(value, np.ndarray):
+        return np.broadcast_to(value.astype(np.float64, copy=False), (n,))
+    if isinstance(value, (tuple, list)):
+        return rng.uniform(value[0], value[1], n)
+    return np.full((n,), value, dtype=np.float64)
+
+
+def _spread_colors(
+    color: Union[ColorType, Tuple[ColorType, ColorType], np.ndarray],
+    n: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    # a pair of colors is a range (every particle gets a random color between them)
+    # an array can be a color for every particle ((n, 3) or (n, 4)) or one color
+    if isinstance(color, np.ndarray):
+        if color.shape[-1] == 3:
+            color = np.concatenate(
+                (color, np.full(color.shape[:-1] + (1,), 255, dtype=color.dtype)), -1
+            )
+        return np.broadcast_to(color, (n, 4))
+    if (
+        isinstance(color, (tuple, list))
+        and len(color) == 2
+        and not isinstance(color[0], (int, float))
+    ):
+        start = np.array(tuple(pygame.Color(color[0])), dtype=np.float64)
+        stop = np.array(tuple(pygame.Color(color[1])), dtype=np.float64)
+        t = rng.random((n, 1))
+        return start + (stop - start) * t
+    return np.broadcast_to(np.array(tuple(pygame.Color(color))), (n, 4))
+
+
+class ParticleArray:
+    """
+    a structure of arrays storage for particles, every attribute of a particle
+    lives in its own numpy array so the whole system can be updated at once.
+    the particles live in preallocated slots, when a particle dies its slot is put
+    in a free list and it is reused by the next particles that are added
+
+    Parameters:
+    -----------
+    capacity: int
+        how many particles can be stored before the arrays have to grow
+
+    Methods:
+    -----------
+    add(x, y, vel_x, vel_y, shrink_amount, size, color, collision_tolerance, gravity):
+        it adds a new particle
+    emit(n, x, y, vel_x, vel_y, shrink_amount, size, color, collision_tolerance, gravity):
+        it adds n particles at once, every value can be a number, a (low, high) range or an array
+    update(dt=1, rects=[]):
+        it shrinks, apply gravity, move and collide with rects and frees the slots of the dead particles
+    draw(surface: pygame.surface.Surface, batched=False, lag=0):
+        it draws the particles (with Surface.blits when batched)
+    get(index: int):
+        it returns a Particle object with the values of a particle
+    indices():
+        it returns the slots of the alive particles
+    clear():
+        it removes all of the particles
+    """
+
+    def __init__(self, capacity: int = 1024):
+        capacity = max(int(capacity), 1)
+        self.count: int = 0
+        self.rng: np.random.Generator = np.random.default_rng()
+        self.pos: np.ndarray = np.zeros((capacity, 2), dtype=np.float64)
+        self.vel: np.ndarray = np.zeros((capacity, 2), dtype=np.float64)
+        self.size: np.ndarray = np.zeros((capacity,), dtype=np.float64)
+        self.shrink: np.ndarray = np.zeros((capacity,), dtype=np.float64)
+        self.gravity: np.ndarray = np.zeros((capacity,), dtype=np.float64)
+        self.tolerance: np.ndarray = np.zeros((capacity,), dtype=np.float64)
+        self.color: np.ndarray = np.zeros((capacity, 4), dtype=np.uint8)
+        self.alive: np.ndarray = np.zeros((capacity,), dtype=np.bool_)
+        # a stack with the free slots, the lowest slots are on the top so the alive particles stay packed
+        self._free: np.ndarray = np.arange(capacity - 1, -1, -1, dtype=np.int64)
+        self._free_count: int = capacity
+        # every slot above this one has never been used
+        self._used: int = 0
+        # the broadphase for the rects, it is rebuilt only when the rects change
+        self._grid: Optional[RectGrid] = None
+        # the slots of the alive particles, it is found again only after particles are added or freed
+        self._indices: Optional[np.ndarray] = None
+
+    @property
+    def capacity(self) -> int:
+        return self.size.shape[0]
+
+    def reserve(self, capacity: int) -> None:
+        """
+        it makes sure that the arrays can hold at least `capacity` particles
+        :param capacity: the amount of particles that need to fit
+        :type capacity: int
+        :return: None
+        """
+        old_capacity = self.capacity
+        if capacity <= old_capacity:
+            return
+        new_capacity = max(capacity, old_capacity * 2)
+        for name in (
+            "pos",
+            "vel",
+            "size",
+            "shrink",
+            "gravity",
+            "tolerance",
+            "color",
+            "alive",
+        ):
+            old = getattr(self, name)
+            new = np.zeros((new_capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:old_capacity] = old
+            setattr(self, name, new)
+        # the new slots go under the old free slots so the low slots are still used first
+        free = np.empty((new_capacity,), dtype=np.int64)
+        added = new_capacity - old_capacity
+        free[:added] = np.arange(new_capacity - 1, old_capacity - 1, -1)
+        free[added : added + self._free_count] = self._free[: self._free_count]
+        self._free = free
+        self._free_count += added
+
+    def _take(self, n: int) -> np.ndarray:
+        # it pops n slots from the free list
+        if n > self._free_count:
+            self.reserve(self.capacity + n - self._free_count)
+        self._free_count -= n
+        # reversed so the lowest slot comes first
+        slots = self._free[self._free_count + n - 1 : self._free_count - 1 : -1]
+        if self._free_count == 0:
+            slots = self._free[n - 1 :: -1]
+        slots = slots.copy()
+        self.alive[slots] = True
+        self._indices = None
+        self.count += n
+        self._used = max(self._used, int(slots.max()) + 1)
+        return slots
+
+    def add(
+        self,
+        x: float,
+        y: float,
+        vel_x: float,
+        vel_y: float,
+        shrink_amount: float,
+        size: float = 7,
+        color: ColorType = (255, 255, 255),
+        collision_tolerance: float = 10,
+        gravity: float = 0.1,
+    ) -> None:
+        """
+        it adds a particle in a free slot
+        :return: None
+        """
+        i = self._take(1)[0]
+        self.pos[i] = x, y
+        self.vel[i] = vel_x, vel_y
+        self.size[i] = size
+        self.shrink[i] = shrink_amount
+        self.gravity[i] = gravity
+        self.tolerance[i] = collision_tolerance
+        self.color[i] = tuple(pygame.Color(color))
+
+    def emit(
+        self,
+        n: int,
+        x: ValuesType,
+        y: ValuesType,
+        vel_x: ValuesType,
+        vel_y: ValuesType,
+        shrink_amount: ValuesType,
+        size: ValuesType = 7,
+        color: Union[ColorType, Tuple[ColorType, ColorType], np.ndarray] = (
+            255,
+            255,
+            255,
+        ),
+        collision_tolerance: ValuesType = 10,
+        gravity: ValuesType = 0.1,
+    ) -> np.ndarray:
+        """
+        it adds n particles with one call, every value can be a number (same for every particle),
+        a (low, high) tuple (a random value in the range for every particle) or an array with a value for every particle
+        the color can be a color, a pair of colors (a random color between them) or an array of colors
+        :param n: the amount of particles
+        :type n: int
+        :return: np.ndarray (the slots of the new particles)
+        """
+        n = int(n)
+        if n <= 0:
+            return np.empty((0,), dtype=np.int64)
+        slots = self._take(n)
+        rng = self.rng
+        if slots[-1] - slots[0] == n - 1:
+            # most of the time the slots are contiguous and a slice is a lot faster than fancy indexing
+            slots = slice(int(slots[0]), int(slots[0]) + n)
+        self.pos[slots, 0] = _spread(x, n, rng)
+        self.pos[slots, 1] = _spread(y, n, rng)
+        self.vel[slots, 0] = _spread(vel_x, n, rng)
+        self.vel[slots, 1] = _spread(vel_y, n, rng)
+        self.shrink[slots] = _spread(shrink_amount, n, rng)
+        self.size[slots] = _spread(size, n, rng)
+        self.tolerance[slots] = _spread(collision_tolerance, n, rng)
+        self.gravity[slots] = _spread(gravity, n, rng)
+        self.color[slots] = _spread_colors(color, n, rng)
+        if isinstance(slots, slice):
+            return np.arange(slots.start, slots.stop)
+        return slots
+
+    def indices(self) -> np.ndarray:
+        """
+        it returns the slots of the alive particles (the array is kept until particles are added or freed so it is read only)
+        :return: np.ndarray
+        """
+        if self._indices is None:
+            self._indices = np.flatnonzero(self.alive[: self._used])
+            self._indices.flags.writeable = False
+        return self._indices
+
+    def clear(self) -> None:
+        self.alive[:] = False
+        self._indices = None
+        self.size[:] = 0
+        self._free[:] = np.arange(self.capacity - 1, -1, -1)
+        self._free_count = self.capacity
+        self._used = 0
+        self.count = 0
+
+    def update(self, dt: float = 1, rects: List[pygame.Rect] = []) -> None:
+        """
+        the vectorized version of Particle.update for all of the particles,
+        after that the slots of the dead particles are put back in the free list
+        :param dt: the delta time
+        :param rects: the rects that the particles are going to collide with
+        :type dt: float
+        :type rects: List[pygame.Rect]
+        :return: None
+        """
+        n = self._used
+        if not self.count:
+            return
+        pos = self.pos[:n]
+        vel = self.vel[:n]
+        size = self.size[:n]
+
+        # the dead slots are updated too, it is cheaper than skipping them
+        # and as they have no velocity, gravity or size they dont change
+        size -= self.shrink[:n] * dt
+        vel[:, 1] += self.gravity[:n] * dt
+        pos += vel * dt
+
+        if rects:
+            self._collide(dt, rects)
+
+        self._free_dead()
+
+    def _free_dead(self) -> None:
+        n = self._used
+        dead = np.flatnonzero(self.alive[:n] & (self.size[:n] <= 0))
+        if not dead.size:
+            return
+        self.alive[dead] = False
+        self._indices = None
+        self.size[dead] = 0
+        self.shrink[dead] = 0
+        self.gravity[dead] = 0
+        self.vel[dead] = 0
+        self._free[self._free_count : self._free_count + dead.size] = dead[::-1]
+        self._free_count += dead.size
+        self.count -= dead.size
+        if not self.count:
+            self._used = 0
+            self._free[:] = np.arange(self.capacity - 1, -1, -1)
+
+    def _collide(self, dt: float, rects: List[pygame.Rect]) -> None:
+        n = self._used
+        pos = self.pos[:n]
+        tol = self.tolerance[:n]
+
+        if nbu.USE_NUMBA:
+            grid = self._grid = RectGrid.cached(self._grid, rects)
+            _collide_particles(
+                pos,
+                self.vel[:n],
+                self.size[:n],
+                tol,
+                grid.edges,
+                grid.starts,
+                grid.items,
+                float(grid.origin[0]),
+                float(grid.origin[1]),
+                grid.cell_size,
+                grid.cols,
+                grid.rows,
+                float(dt),
+            )
+            return
+
+        side = self.size[:n] * 2
+
+        # the particle rect is inflated instead of the rect so the test is done once for every particle
+        x0 = pos[:, 0] - tol
+        y0 = pos[:, 1] - tol
+        x1 = pos[:, 0] + side + tol
+        y1 = pos[:, 1] + side + tol
+
+        if len(rects) < BROADPHASE_MIN_RECTS:
+            for rect in rects:
+                hit = np.flatnonzero(
+                    (x0 < rect.right)
+                    & (rect.left < x1)
+                    & (y0 < rect.bottom)
+                    & (rect.top < y1)
+                    & (side > 0)
+                )
+                if not hit.size:
+                    continue
+                self._bounce(dt, hit, rect.left, rect.top, rect.right, rect.bottom)
+                x0[hit] = pos[hit, 0] - tol[hit]
+                y0[hit] = pos[hit, 1] - tol[hit]
+                x1[hit] = pos[hit, 0] + side[hit] + tol[hit]
+                y1[hit] = pos[hit, 1] + side[hit] + tol[hit]
+            return
+
+        self._grid = RectGrid.cached(self._grid, rects)
+        # a bounce can move a particle a bit so the area that is searched is a bit bigger
+        pad = np.abs(self.vel[:n]).sum(1) * (3 * dt * dt)
+        particles, candidates = self._grid.query(x0 - pad, y0 - pad, x1 + pad, y1 + pad)
+        if not particles.size:
+            return
+        self._bounce_candidates(dt, particles, candidates, self._grid.edges)
+
+    def _bounce_candidates(
+        self,
+        dt: float,
+        particles: np.ndarray,
+        candidates: np.ndarray,
+        edges: np.ndarray,
+    ) -> None:
+        # the pairs are sorted by particle and then by rect, the nth rect of every particle
+        # is handled at the same time so the rects are still tested in order for each particle
+        firsts = np.flatnonzero(np.r_[True, particles[1:] != particles[:-1]])
+        counts = np.diff(np.r_[firsts, particles.shape[0]])
+        rank = np.arange(particles.shape[0]) - np.repeat(firsts, counts)
+        for k in range(int(counts.max())):
+            sel = rank == k
+            e = edges[candidates[sel]]
+            self._bounce(dt, particles[sel], e[:, 0], e[:, 1], e[:, 2], e[:, 3])
+
+    def _bounce(
+        self,
+        dt: float,
+        idx: np.ndarray,
+        left: Union[float, np.ndarray],
+        top: Union[float, np.ndarray],
+        right: Union[float, np.ndarray],
+        bottom: Union[float, np.ndarray],
+    ) -> None:
+        # the collision response of Particle.update for the particles in idx (each one at most once)
+        x, y = self.pos[idx, 0], self.pos[idx, 1]
+        vx, vy = self.vel[idx, 0], self.vel[idx, 1]
+        t, s = self.tolerance[idx], self.size[idx] * 2
+        # the restitution doesnt depend on dt so substeps bounce the same way
+        damping = -0.75
+
+        # the edges of the rect inflated by the collision tolerance of each particle
+        left = left - t
+        top = top - t
+        right = right + t
+        bottom = bottom + t
+
+        hit = (s > 0) & (x < right) & (left < x + s) & (y < bottom) & (top < y + s)
+
+        # the checks are done in the same order as Particle.update
+        # as every one of them can change the values for the next one
+        mask = hit & (np.abs(top - (y + s)) < t) & (vy > 0)
+        vy[mask] *= damping
+        y[mask] += (vy[mask] * 2) * dt
+
+        mask = hit & (np.abs(bottom - y) < t) & (vy < 0)
+        vy[mask] *= damping
+        y[mask] += (vy[mask] * 2) * dt
+
+        mask = hit & (np.abs(right - x) < t) & (vx < 0)
+        vx[mask] *= damping
+        x[mask] += (vx[mask] * 2) * dt
+
+        mask = hit & (np.abs(left - (x + s)) < t) & (vx > 0)
+        vx[mask] *= damping
+        x[mask] += (vx[mask] * 2) * dt
+
+        self.pos[idx, 0], self.pos[idx, 1] = x, y
+        self.vel[idx, 0], self.vel[idx, 1] = vx, vy
+
+    def draw(
+        self, surface: pygame.surface.Surface, batched: bool = False, lag: float = 0
+    ) -> None:
+        """
+        it draws the particles
+        :param surface: the surface that the particles will be drawn in
+        :param batched: if True the circles are pre-rendered for every radius and color and they are drawn with Surface.blits (one call for every bucket)
+        :param lag: how far back in time the particles are drawn with their velocities (FixedTimestep.lag)
+        :type surface: pygame.surface.Surface
+        :type batched: bool
+        :type lag: float
+        :return: None
+        """
+        idx = self.indices()
+        pos = self.pos[idx]
+        if lag:
+            pos -= self.vel[idx] * lag
+        if not batched:
+            for center, color, size in zip(
+                pos.tolist(),
+                self.color[idx].tolist(),
+                self.size[idx].tolist(),
+            ):
+                pygame.draw.circle(surface, color, center, size)
+            return
+
+        radius = self.size[idx].astype(np.int64)
+        visible = radius > 0
+        idx, radius, pos = idx[visible], radius[visible], pos[visible]
+        if not idx.size:
+            return
+        color = self.color[idx, :3].astype(np.int64)
+        # one key for every (radius, color) bucket
+        keys = (radius << 24) | (color[:, 0] << 16) | (color[:, 1] << 8) | color[:, 2]
+        buckets, inverse = np.unique(keys, return_inverse=True)
+        # the particles are grouped by bucket so every bucket is a single zip over the positions
+        order = np.argsort(inverse, kind="stable")
+        ends = np.cumsum(np.bincount(inverse)).tolist()
+        topleft = (pos[order] - radius[order, None]).astype(np.int64).tolist()
+        start = 0
+        for key, end in zip(buckets.tolist(), ends):
+            sprite = _circle_sprite(
+                key >> 24, ((key >> 16) & 255, (key >> 8) & 255, key & 255)
+            )
+            surface.blits(zip(repeat(sprite), topleft[start:end]), False)
+            start = end
+
+    def get(self, index: int) -> Particle:
+        """
+        it creates a Particle object with the values of the nth alive particle (changes on it will not be reflected back)
+        :param index: the index of the particle
+        :type index: int
+        :return: Particle
+        """
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("particle index out of range")
+        return self._particle(int(self.indices()[index]))
+
+    def _particle(self, slot: int) -> Particle:
+        return Particle(
+            self.pos[slot, 0],
+            self.pos[slot, 1],
+            float(self.vel[slot, 0]),
+            float(self.vel[slot, 1]),
+            float(self.shrink[slot]),
+            float(self.size[slot]),
+            tuple(self.color[slot, :3].tolist()),
+            float(self.tolerance[slot]),
+            float(self.gravity[slot]),
+        )
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Particle]:
+        return (self._particle(slot) for slot in self.indices().tolist())
+
+    def __repr__(self) -> str:
+        return (
+            f"ParticleArray with {self.count} particles and capacity: {self.capacity}"
+        )
+
+    def __str__(self) -> str:
+        return (
+            f"ParticleArray with {self.count} particles and capacity: {self.capacity}"
+        )
+
+
+def build_particle_numba() -> None:
+    particles = ParticleArray(4)
+    particles.emit(4, (0, 10), (0, 10), (-1, 1), (-1, 1), 0.1, 2, (255, 255, 255))
+    particles.update(1, [pygame.Rect(0, 0, 5, 5)])
@@ -25,11 +25,16 @@
 a quad tree implementation
 """
 
-from typing import List, Any
+from typing import List, Any, Optional, Tuple, Union, Sequence, Dict
 from PygameHaze.types import *
 
+import numpy as np
 import itertools
 import pygame
+import heapq
+
+# the deepest level of a QuadTreeArray, the morton codes use 2 bits for every level
+_MAX_DEPTH: int = 16
 
 
 class QuadTree:
@@ -50,18 +55,64 @@ class QuadTree:
     list_insert(objs: List[Any]):
         it inserts a list of objects in the QuadTree
     insert(obj: Any):
-        it inserts a object on the QuadTree (it needs to have a .pos attribute)
+        it inserts a object on the QuadTree (it needs to have a .pos or a .rect attribute)
     query(rectangle: pygame.Rect):
         it returns all of the objects that can be found in a given area
+    query_circle(center: CoordsType, radius: float):
+        it returns all of the objects that are in a distance <= radius from the center
+    nearest(pos: CoordsType, k: int):
+        it returns the k closest objects to a position
+    remove(obj: Any):
+        it removes an object from the QuadTree
+    relocate(obj: Any):
+        it moves an object to the right node after its position has changed
+    mark_moved(obj: Any):
+        it marks an object whose position has changed for the next update_positions
+    update_positions(check_all: bool):
+        it relocates the marked objects that have left their nodes
+    collide_pairs():
+        it returns all of the pairs of objects that collide with each other
+    from_array(space: pygame.Rect, capacity: int, positions: np.ndarray, ids: Optional[np.ndarray]):
+        it builds a QuadTreeArray from an array of positions
     """
 
-    __slots__ = "space", "capacity", "storage", "children"
+    __slots__ = (
+        "space",
+        "capacity",
+        "storage",
+        "children",
+        "parent",
+        "locations",
+        "moved",
+    )
 
     def __init__(self, space: pygame.Rect, capacity: int) -> None:
         self.space: pygame.Rect = space
         self.capacity: int = capacity
         self.storage: List[Any] = []
         self.children: List[QuadTree] = []
+        self.parent: Optional[QuadTree] = None
+        # the node of every object (by id), it is shared by all of the nodes of a tree
+        self.locations: Dict[int, QuadTree] = {}
+        # the objects (by id) that were marked as moved since the last update_positions, also shared
+        self.moved: Dict[int, Any] = {}
+
+    @staticmethod
+    def from_array(
+        space: RectType,
+        capacity: int,
+        positions: np.ndarray,
+        ids: Optional[np.ndarray] = None,
+    ) -> "QuadTreeArray":
+        """
+        it builds an array backed quad tree with all of the positions at once
+        :param space: the location of the QuadTree
+        :param capacity: how many positions a leaf can have
+        :param positions: an (N, 2) array with the positions
+        :param ids: an (N,) array with an id for every position (by default the index of the position)
+        :return: QuadTreeArray
+        """
+        return QuadTreeArray(space, capacity, positions, ids)
 
     def get_items(self) -> List[Any]:
         """
@@ -78,18 +129,17 @@ class QuadTree:
         :return: None
         """
         new_size = self.space.w / 2, self.space.h / 2
-        self.children.append(
-            QuadTree(pygame.Rect(*self.space.topleft, *new_size), self.capacity)
-        )
-        self.children.append(
-            QuadTree(pygame.Rect(*self.space.midtop, *new_size), self.capacity)
-        )
-        self.children.append(
-            QuadTree(pygame.Rect(*self.space.center, *new_size), self.capacity)
-        )
-        self.children.append(
-            QuadTree(pygame.Rect(*self.space.midleft, *new_size), self.capacity)
-        )
+        for corner in (
+            self.space.topleft,
+            self.space.midtop,
+            self.space.center,
+            self.space.midleft,
+        ):
+            child = QuadTree(pygame.Rect(*corner, *new_size), self.capacity)
+            child.parent = self
+            child.locations = self.locations
+            child.moved = self.moved
+            self.children.append(child)
 
     def list_insert(self, objs: List[Any]) -> "QuadTree":
         """
@@ -102,14 +152,20 @@ class QuadTree:
 
     def insert(self, obj: Any) -> bool:
         """
-        it accepts an object and inserts it into the quad tree (the object needs to have a .pos attribute)
+        it accepts an object and inserts it into the quad tree (the object needs to have a .pos attribute),
+        objects with a .rect attribute (like pygame sprites) are kept in the deepest node that contains all of the rect
         :param obj: Any
         :return: bool
         """
+        if hasattr(obj, "rect"):
+            if not self.space.colliderect(obj.rect):
+                return False
+            return self._insert_rect(obj)
         if not self.space.collidepoint(obj.pos):
             return False
         if len(self.storage) < self.capacity:
             self.storage.append(obj)
+            self.locations[id(obj)] = self
             return True
         else:
             if not self.children:
@@ -119,6 +175,147 @@ class QuadTree:
                     return True
         return False
 
+    def _insert_rect(self, obj: Any) -> bool:
+        # the node already holds the rect, it only goes down to a child that holds all of it
+        if len(self.storage) >= self.capacity:
+            if not self.children:
+                self.subdivide()
+            for ch in self.children:
+                if ch.space.contains(obj.rect):
+                    return ch._insert_rect(obj)
+        self.storage.append(obj)
+        self.locations[id(obj)] = self
+        return True
+
+    def _fits(self, obj: Any) -> bool:
+        # if the object belongs in the node (the root also keeps the rects that stick out of it)
+        if hasattr(obj, "rect"):
+            if self.parent is None:
+                return self.space.colliderect(obj.rect)
+            return self.space.contains(obj.rect)
+        return self.space.collidepoint(obj.pos)
+
+    def remove(self, obj: Any) -> bool:
+        """
+        it removes an object from the tree, the nodes that are left with fewer objects than the capacity are merged
+        :param obj: Any
+        :return: bool (False if the object was not in the tree)
+        """
+        node = self.locations.pop(id(obj), None)
+        if node is None:
+            return False
+        self.moved.pop(id(obj), None)
+        for i, item in enumerate(node.storage):
+            if item is obj:
+                del node.storage[i]
+                break
+        node._merge()
+        return True
+
+    def _merge(self) -> None:
+        # it collapses the children of the nodes (from this one and up) that fit in a single node
+        node = self
+        while node is not None:
+            if node.children:
+                if any(ch.children for ch in node.children):
+                    return
+                if (
+                    len(node.storage) + sum(len(ch.storage) for ch in node.children)
+                    > node.capacity
+                ):
+                    return
+                for ch in node.children:
+                    for obj in ch.storage:
+                        node.storage.append(obj)
+                        node.locations[id(obj)] = node
+                    ch.parent = node  # detached children keep pointing to the node that took their place
+                node.children = []
+            node = node.parent
+
+    def relocate(self, obj: Any) -> bool:
+        """
+        it moves an object to the right node after its position has changed,
+        if it is still inside its node nothing happens
+        :param obj: Any
+        :return: bool (False if the object is no longer inside the tree, then it is removed)
+        """
+        node = self.locations.get(id(obj))
+        if node is None:
+            return False
+        if node._fits(obj):
+            return True
+        # the closest ancestor that can take the object
+        ancestor = node.parent
+        while ancestor is not None and not ancestor._fits(obj):
+            ancestor = ancestor.parent
+        self.remove(obj)
+        if ancestor is None:
+            return False
+        # the ancestor may have been merged into its parent
+        while ancestor.parent is not None and ancestor not in ancestor.parent.children:
+            ancestor = ancestor.parent
+        return ancestor.insert(obj)
+
+    def mark_moved(self, obj: Any) -> None:
+        """
+        it marks an object whose position has changed, the next update_positions only checks the marked objects
+        :param obj: Any
+        :return: None
+        """
+        if id(obj) in self.locations:
+            self.moved[id(obj)] = obj
+
+    def update_positions(self, check_all: bool = False) -> int:
+        """
+        it relocates the marked objects (see mark_moved) that have moved out of their nodes,
+        the objects that were not marked are not touched so a scene that doesnt move costs nothing
+        :param check_all: bool (every object is checked, for objects that were moved without being marked)
+        :return: int (how many objects were relocated)
+        """
+        if check_all:
+            candidates = [(node, obj) for node in self._nodes() for obj in node.storage]
+        else:
+            candidates = [(self.locations[key], obj) for key, obj in self.moved.items()]
+        self.moved.clear()
+        moved = [obj for node, obj in candidates if not node._fits(obj)]
+        for obj in moved:
+            self.relocate(obj)
+        return len(moved)
+
+    def collide_pairs(self) -> List[Tuple[Any, Any]]:
+        """
+        it returns all of the pairs of objects that collide (pygame.Rect.colliderect),
+        the tree is walked once and every object is only tested against the objects of its node and of the nodes above it
+        (objects without a .rect are treated as 1x1 rects at their position)
+        :return: List[Tuple[Any, Any]]
+        """
+        pairs = []
+        # every node with the objects and the rects of all of the nodes above it
+        stack = [(self, [], [])]
+        while stack:
+            node, above, above_rects = stack.pop()
+            objs = node.storage
+            rects = [_rect_of(obj) for obj in objs]
+            for i, rect in enumerate(rects):
+                obj = objs[i]
+                pairs.extend((above[j], obj) for j in rect.collidelistall(above_rects))
+                pairs.extend(
+                    (obj, objs[i + 1 + j]) for j in rect.collidelistall(rects[i + 1 :])
+                )
+            if node.children:
+                above = above + objs
+                above_rects = above_rects + rects
+                stack.extend((ch, above, above_rects) for ch in node.children)
+        return pairs
+
+    def _nodes(self) -> List["QuadTree"]:
+        nodes = [self]
+        i = 0
+        while i < len(nodes):
+            nodes.extend(nodes[i].children)
+            i += 1
+        return nodes
+
     def query(self, rectangle: pygame.Rect) -> List[Any]:
         """
         it accepts an area to look for items
@@ -130,12 +327,66 @@ class QuadTree:
         found = []
         if self.space.colliderect(rectangle):
             for obj in self.storage:
-                if rectangle.collidepoint(obj.pos):
+                if hasattr(obj, "rect"):
+                    if rectangle.colliderect(obj.rect):
+                        found.append(obj)
+                elif rectangle.collidepoint(obj.pos):
                     found.append(obj)
             for ch in self.children:
                 found.extend(ch.query(rectangle))
         return found
 
+    def query_circle(self, center: CoordsType, radius: float) -> List[Any]:
+        """
+        it returns all of the objects that are in a distance <= radius from the center
+        :param center: CoordsType
+        :param radius: float
+        :return: List[Any]
+        """
+        x, y = center
+        r2 = radius * radius
+        space = self.space
+        # the distance to the closest point of the space
+        dx = max(space.left - x, 0, x - space.right)
+        dy = max(space.top - y, 0, y - space.bottom)
+        if dx * dx + dy * dy > r2:
+            return []
+        # the distance to the furthest corner of the space
+        dx = max(abs(space.left - x), abs(space.right - x))
+        dy = max(abs(space.top - y), abs(space.bottom - y))
+        if dx * dx + dy * dy <= r2:
+            return self.get_items()
+        found = [obj for obj in self.storage if _distance2(obj, x, y) <= r2]
+        for ch in self.children:
+            found.extend(ch.query_circle(center, radius))
+        return found
+
+    def nearest(self, pos: CoordsType, k: int = 1) -> List[Any]:
+        """
+        it returns the k closest objects to a position (the closest first),
+        the nodes are visited from the closest to the furthest and it stops once k objects are found
+        :param pos: CoordsType
+        :param k: int
+        :return: List[Any]
+        """
+        x, y = pos
+        found = []
+        counter = itertools.count()  # so the objects never have to be compared
+        heap = [(0, next(counter), True, self)]
+        while heap and len(found) < k:
+            _, _, is_node, item = heapq.heappop(heap)
+            if not is_node:
+                found.append(item)
+                continue
+            for obj in item.storage:
+                heapq.heappush(heap, (_distance2(obj, x, y), next(counter), False, obj))
+            for ch in item.children:
+                space = ch.space
+                dx = max(space.left - x, 0, x - space.right)
+                dy = max(space.top - y, 0, y - space.bottom)
+                heapq.heappush(heap, (dx * dx + dy * dy, next(counter), True, ch))
+        return found
+
     def draw(
         self, WIN: pygame.surface.Surface, color: ColorType = (255, 255, 255)
     ) -> None:
@@ -148,3 +399,404 @@ class QuadTree:
         pygame.draw.rect(WIN, color, self.space, 1)
         for ch in self.children:
             ch.draw(WIN, color)
+
+
+def _rect_of(obj: Any) -> pygame.Rect:
+    # the rect of an object, a point is a 1x1 rect
+    if hasattr(obj, "rect"):
+        return obj.rect
+    return pygame.Rect(obj.pos, (1, 1))
+
+
+def _distance2(obj: Any, x: float, y: float) -> float:
+    # the squared distance from a point to an object (to the closest point of its rect if it has one)
+    if hasattr(obj, "rect"):
+        rect = obj.rect
+        dx = max(rect.left - x, 0, x - rect.right)
+        dy = max(rect.top - y, 0, y - rect.bottom)
+        return dx * dx + dy * dy
+    return (obj.pos[0] - x) ** 2 + (obj.pos[1] - y) ** 2
+
+
+def _spread_bits(v: np.ndarray) -> np.ndarray:
+    # it puts a zero bit between every bit of a 16 bit number (used for the morton codes)
+    v = v & 0xFFFF
+    v = (v | (v << 8)) & 0x00FF00FF
+    v = (v | (v << 4)) & 0x0F0F0F0F
+    v = (v | (v << 2)) & 0x33333333
+    v = (v | (v << 1)) & 0x55555555
+    return v
+
+
+def _ranges(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    # all of the indexes of the ranges [start, start + count) one after the other
+    total = int(counts.sum())
+    offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return offsets + np.arange(total, dtype=np.int64)
+
+
+class QuadTreeArray:
+    """
+    QuadTree data structure that is stored in flat numpy arrays, it is built
+    all at once from an array of positions so it can be rebuilt every frame
+
+    Parameters:
+    -----------
+    space: pygame.Rect
+        the location of the QuadTree
+    capacity: int
+        how many positions a leaf can have
+    positions: np.ndarray
+        an (N, 2) array with the positions (the positions outside of the space are ignored)
+    ids: Optional[np.ndarray]
+        an (N,) array with an id for every position, by default the index of the position
+
+    Methods:
+    -----------
+    get_items():
+        it returns the ids of all of the positions in the QuadTree
+    query(rectangle: pygame.Rect):
+        it returns the ids of the positions that can be found in a given area
+    query_many(rectangles):
+        it answers many area queries at once and it returns the result as (offsets, ids)
+    query_radius(points: np.ndarray, radius):
+        it finds the positions near every point and it returns the result as (offsets, ids)
+    query_circle(center: CoordsType, radius: float):
+        it returns the ids of the positions that are in a distance <= radius from the center
+    nearest(pos: CoordsType, k: int):
+        it returns the ids of the k closest positions to a position
+    draw(WIN: pygame.surface.Surface, color):
+        it draws the nodes of the QuadTree
+    """
+
+    __slots__ = (
+        "space",
+        "capacity",
+        "positions",
+        "ids",
+        "node_space",
+        "node_bounds",
+        "node_start",
+        "node_count",
+        "node_child",
+    )
+
+    def __init__(
+        self,
+        space: RectType,
+        capacity: int,
+        positions: np.ndarray,
+        ids: Optional[np.ndarray] = None,
+    ) -> None:
+        self.space: pygame.Rect = pygame.Rect(space)
+        self.capacity: int = max(int(capacity), 1)
+
+        positions = np.asarray(positions, dtype=np.float64).reshape((-1, 2))
+        if ids is None:
+            ids = np.arange(positions.shape[0], dtype=np.int64)
+        else:
+            ids = np.asarray(ids).reshape((-1,))
+
+        x0, y0, w, h = self.space
+        # the same rules as pygame.Rect.collidepoint
+        inside = np.flatnonzero(
+            (positions[:, 0] >= x0)
+            & (positions[:, 0] < x0 + w)
+            & (positions[:, 1] >= y0)
+            & (positions[:, 1] < y0 + h)
+        )
+        positions = positions[inside]
+        ids = ids[inside]
+
+        # the positions are sorted by their morton code, that way every node
+        # owns a contiguous range of the arrays
+        cells = 1 << _MAX_DEPTH
+        qx = np.clip(
+            ((positions[:, 0] - x0) * (cells / w)).astype(np.int64), 0, cells - 1
+        )
+        qy = np.clip(
+            ((positions[:, 1] - y0) * (cells / h)).astype(np.int64), 0, cells - 1
+        )
+        codes = (_spread_bits(qx) | (_spread_bits(qy) << 1)).astype(np.uint32)
+        order = np.argsort(codes)
+        codes = codes[order]
+        self.positions: np.ndarray = positions[order]
+        self.ids: np.ndarray = ids[order]
+
+        n = codes.shape[0]
+        quadrant = np.arange(4, dtype=np.int64)
+        spaces = [np.array([[x0, y0, w, h]], dtype=np.float64)]
+        starts = [np.zeros((1,), dtype=np.int64)]
+        counts = [np.array([n], dtype=np.int64)]
+        links = []  # the (parents, first children) of every level
+        total = 1
+
+        # every level is split at once, the 4 children of a node are next to each other
+        # in the order: topleft, topright, bottomleft, bottomright
+        split = np.flatnonzero(counts[0] > self.capacity)
+        frontier = split
+        prefix = np.zeros((split.shape[0],), dtype=np.int64)
+        for level in range(_MAX_DEPTH):
+            if not frontier.shape[0]:
+                break
+            k = frontier.shape[0]
+            parent_space = spaces[-1][split]
+            parent_start = starts[-1][split]
+            parent_end = parent_start + counts[-1][split]
+
+            shift = 2 * (_MAX_DEPTH - level - 1)
+            prefixes = (prefix[:, None] << 2) | quadrant
+            bounds = np.empty((k, 5), dtype=np.int64)
+            bounds[:, 0] = parent_start
+            bounds[:, 1:4] = np.searchsorted(
+                codes, (prefixes[:, 1:] << shift).astype(np.uint32)
+            )
+            bounds[:, 4] = parent_end
+
+            half_w = parent_space[:, 2, None] / 2
+            half_h = parent_space[:, 3, None] / 2
+            child_space = np.empty((k, 4, 4), dtype=np.float64)
+            child_space[:, :, 0] = parent_space[:, 0, None] + (quadrant & 1) * half_w
+            child_space[:, :, 1] = parent_space[:, 1, None] + (quadrant >> 1) * half_h
+            child_space[:, :, 2] = half_w
+            child_space[:, :, 3] = half_h
+
+            first = total + np.arange(k, dtype=np.int64) * 4
+            links.append((frontier, first))
+            spaces.append(child_space.reshape((-1, 4)))
+            starts.append(bounds[:, :4].reshape((-1,)))
+            counts.append(np.diff(bounds, axis=1).reshape((-1,)))
+            total += k * 4
+
+            split = np.flatnonzero(counts[-1] > self.capacity)
+            frontier = (first[:, None] + quadrant).reshape((-1,))[split]
+            prefix = prefixes.reshape((-1,))[split]
+
+        self.node_space: np.ndarray = np.concatenate(spaces)
+        self.node_start: np.ndarray = np.concatenate(starts)
+        self.node_count: np.ndarray = np.concatenate(counts)
+        self.node_child: np.ndarray = np.full((total,), -1, dtype=np.int64)
+        for parents, firsts in links:
+            self.node_child[parents] = firsts
+
+        # the tight bounds (min x, min y, max x, max y) of the positions of every node,
+        # the leaves cover the sorted positions without gaps so they can be reduced at once
+        self.node_bounds: np.ndarray = np.empty((total, 4), dtype=np.float64)
+        self.node_bounds[:, :2] = np.inf
+        self.node_bounds[:, 2:] = -np.inf
+        leaves = np.flatnonzero((self.node_child == -1) & (self.node_count > 0))
+        if leaves.shape[0]:
+            leaves = leaves[np.argsort(self.node_start[leaves], kind="stable")]
+            leaf_start = self.node_start[leaves]
+            for axis in range(2):
+                values = self.positions[:, axis]
+                self.node_bounds[leaves, axis] = np.minimum.reduceat(values, leaf_start)
+                self.node_bounds[leaves, axis + 2] = np.maximum.reduceat(
+                    values, leaf_start
+                )
+        for parents, firsts in reversed(links):
+            quads = self.node_bounds[firsts[:, None] + quadrant]
+            self.node_bounds[parents, :2] = quads[:, :, :2].min(1)
+            self.node_bounds[parents, 2:] = quads[:, :, 2:].max(1)
+
+    def __len__(self) -> int:
+        return self.ids.shape[0]
+
+    def get_items(self) -> np.ndarray:
+        """
+        it returns the ids of all of the positions
+        :return: np.ndarray
+        """
+        return self.ids
+
+    def _collect(
+        self, count: int, overlaps, contains, accepts
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # it walks the tree for `count` queries at once, level by level, with (query, node) pairs
+        # overlaps(q, bounds) -> the node can have positions for the query
+        # contains(q, bounds) -> all of the positions of the node are accepted
+        # accepts(q, positions) -> the positions that are accepted
+        queries = [np.empty((0,), dtype=np.int64)]
+        found = [np.empty((0,), dtype=np.int64)]
+        quadrant = np.arange(4, dtype=np.int64)
+        q = np.arange(count, dtype=np.int64)
+        nodes = np.zeros((count,), dtype=np.int64)
+        while q.shape[0]:
+            keep = overlaps(q, self.node_bounds[nodes])
+            q, nodes = q[keep], nodes[keep]
+            inside = contains(q, self.node_bounds[nodes])
+            leaf = self.node_child[nodes] == -1
+
+            # the nodes that are completely inside are taken as they are
+            whole = np.flatnonzero(inside)
+            counts = self.node_count[nodes[whole]]
+            queries.append(np.repeat(q[whole], counts))
+            found.append(_ranges(self.node_start[nodes[whole]], counts))
+
+            # the positions of the leaves that are partially inside are tested one by one
+            partial = np.flatnonzero(leaf & ~inside)
+            counts = self.node_count[nodes[partial]]
+            pq = np.repeat(q[partial], counts)
+            idx = _ranges(self.node_start[nodes[partial]], counts)
+            hit = accepts(pq, self.positions[idx])
+            queries.append(pq[hit])
+            found.append(idx[hit])
+
+            down = np.flatnonzero(~leaf & ~inside)
+            q = np.repeat(q[down], 4)
+            nodes = (self.node_child[nodes[down], None] + quadrant).reshape((-1,))
+        return np.concatenate(queries), np.concatenate(found)
+
+    def _csr(
+        self, count: int, queries: np.ndarray, found: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        order = np.argsort(queries, kind="stable")
+        offsets = np.zeros((count + 1,), dtype=np.int64)
+        np.cumsum(np.bincount(queries, minlength=count), out=offsets[1:])
+        return offsets, self.ids[found[order]]
+
+    def query(self, rectangle: RectType) -> np.ndarray:
+        """
+        it accepts an area to look for positions and it returns their ids
+        :param rectangle: RectType
+        :return: np.ndarray
+        """
+        return self.query_many([rectangle])[1]
+
+    def query_many(
+        self, rectangles: Union[Sequence[RectType], np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        it answers many area queries at once, the result is in CSR form:
+        the ids for the rectangle i are ids[offsets[i]:offsets[i + 1]]
+        :param rectangles: a list of rects or an (M, 4) array of (x, y, w, h)
+        :return: Tuple[np.ndarray, np.ndarray] (offsets, ids)
+        """
+        if isinstance(rectangles, np.ndarray):
+            rects = rectangles.astype(np.float64).reshape((-1, 4))
+        else:
+            rects = np.array(
+                [tuple(pygame.Rect(r)) for r in rectangles], dtype=np.float64
+            ).reshape((-1, 4))
+        x0, y0 = rects[:, 0], rects[:, 1]
+        x1, y1 = x0 + rects[:, 2], y0 + rects[:, 3]
+
+        def overlaps(q, b):
+            return (
+                (b[:, 0] < x1[q])
+                & (b[:, 2] >= x0[q])
+                & (b[:, 1] < y1[q])
+                & (b[:, 3] >= y0[q])
+            )
+
+        def contains(q, b):
+            return (
+                (b[:, 0] >= x0[q])
+                & (b[:, 2] < x1[q])
+                & (b[:, 1] >= y0[q])
+                & (b[:, 3] < y1[q])
+            )
+
+        def accepts(q, p):
+            # the same rules as pygame.Rect.collidepoint
+            return (
+                (p[:, 0] >= x0[q])
+                & (p[:, 0] < x1[q])
+                & (p[:, 1] >= y0[q])
+                & (p[:, 1] < y1[q])
+            )
+
+        count = rects.shape[0]
+        return self._csr(count, *self._collect(count, overlaps, contains, accepts))
+
+    def query_radius(
+        self, points: np.ndarray, radius: Union[float, np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        it finds the positions that are in a distance <= radius from every point, the result is in CSR form:
+        the ids for the point i are ids[offsets[i]:offsets[i + 1]]
+        :param points: an (M, 2) array with the centers
+        :param radius: the radius for all of the points or an (M,) array with a radius for every point
+        :return: Tuple[np.ndarray, np.ndarray] (offsets, ids)
+        """
+        points = np.asarray(points, dtype=np.float64).reshape((-1, 2))
+        count = points.shape[0]
+        px, py = points[:, 0], points[:, 1]
+        r2 = np.broadcast_to(np.asarray(radius, dtype=np.float64) ** 2, (count,))
+
+        def overlaps(q, b):
+            # the distance from the center to the closest point of the bounds
+            dx = np.maximum(np.maximum(b[:, 0] - px[q], px[q] - b[:, 2]), 0)
+            dy = np.maximum(np.maximum(b[:, 1] - py[q], py[q] - b[:, 3]), 0)
+            return dx * dx + dy * dy <= r2[q]
+
+        def contains(q, b):
+            # the distance from the center to the furthest corner of the bounds
+            dx = np.maximum(np.abs(b[:, 0] - px[q]), np.abs(b[:, 2] - px[q]))
+            dy = np.maximum(np.abs(b[:, 1] - py[q]), np.abs(b[:, 3] - py[q]))
+            return dx * dx + dy * dy <= r2[q]
+
+        def accepts(q, p):
+            dx = p[:, 0] - px[q]
+            dy = p[:, 1] - py[q]
+            return dx * dx + dy * dy <= r2[q]
+
+        return self._csr(count, *self._collect(count, overlaps, contains, accepts))
+
+    def query_circle(self, center: CoordsType, radius: float) -> np.ndarray:
+        """
+        it returns the ids of the positions that are in a distance <= radius from the center
+        :param center: CoordsType
+        :param radius: float
+        :return: np.ndarray
+        """
+        return self.query_radius(np.array([tuple(center)]), radius)[1]
+
+    def nearest(self, pos: CoordsType, k: int = 1) -> np.ndarray:
+        """
+        it returns the ids of the k closest positions to a position (the closest first),
+        the nodes are visited from the closest to the furthest and it stops once k positions are found
+        :param pos: CoordsType
+        :param k: int
+        :return: np.ndarray
+        """
+        x, y = pos
+        found = []
+        # (distance squared, is a position, node or position index)
+        heap = [(0.0, False, 0)]
+        while heap and len(found) < k:
+            _, is_position, i = heapq.heappop(heap)
+            if is_position:
+                found.append(i)
+                continue
+            if not self.node_count[i]:
+                continue
+            child = self.node_child[i]
+            if child == -1:
+                start = self.node_start[i]
+                p = self.positions[start : start + self.node_count[i]]
+                d = (p[:, 0] - x) ** 2 + (p[:, 1] - y) ** 2
+                for dist, idx in zip(d.tolist(), range(start, start + d.shape[0])):
+                    heapq.heappush(heap, (dist, True, idx))
+                continue
+            b = self.node_bounds[child : child + 4]
+            dx = np.maximum(np.maximum(b[:, 0] - x, x - b[:, 2]), 0)
+            dy = np.maximum(np.maximum(b[:, 1] - y, y - b[:, 3]), 0)
+            for dist, node in zip(
+                (dx * dx + dy * dy).tolist(), range(child, child + 4)
+            ):
+                if dist != np.inf:
+                    heapq.heappush(heap, (dist, False, node))
+        return self.ids[np.array(found, dtype=np.int64)]
+
+    def draw(
+        self, WIN: pygame.surface.Surface, color: ColorType = (255, 255, 255)
+    ) -> None:
+        """
+        it draws the quad tree (wireframe)
+        :param WIN: pygame.surface.Surface
+        :param color: Tuple[int, int, int]
+        :return: None
+        """
+        for space in self.node_space.tolist():
+            pygame.draw.rect(WIN, color, space, 1)
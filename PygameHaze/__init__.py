@@ -10,13 +10,16 @@ from PygameHaze.Classes import InputField
 from PygameHaze.Classes import InputFieldNumbers
 from PygameHaze.Classes import InputFieldLetters
 from PygameHaze.Classes import Particle
+from PygameHaze.Classes import ParticleArray
 from PygameHaze.Classes import Animation
 from PygameHaze.Classes import SpriteSheet
 from PygameHaze.Classes import Font
 from PygameHaze.Classes import Cloth
+from PygameHaze.Classes import ClothArray
 from PygameHaze.Classes import Point
 from PygameHaze.Classes import Connection
 from PygameHaze.Classes import QuadTree
+from PygameHaze.Classes import QuadTreeArray
 
 # the managers for some classes
 from PygameHaze.Classes import ParticleManager
@@ -102,6 +105,60 @@ def init(debug: bool = False) -> int:
             print(traceback.format_exc(), file=sys.stderr)
         failed += 1
 
+    try:
+        if debug:
+            print("[DEBUG] building the particle collisions")
+
+        from PygameHaze.Classes.particle import build_particle_numba
+
+        build_particle_numba()
+
+        if debug:
+            print("[DEBUG] successfully built the particle collisions")
+    except Exception:
+        if debug:
+            print("[DEBUG] failed to pre-build the particle collisions", file=sys.stderr)
+            import traceback
+
+            print(traceback.format_exc(), file=sys.stderr)
+        failed += 1
+
+    try:
+        if debug:
+            print("[DEBUG] building the cloth solvers")
+
+        from PygameHaze.Classes.cloth import build_cloth_numba
+
+        build_cloth_numba()
+
+        if debug:
+            print("[DEBUG] successfully built the cloth solvers")
+    except Exception:
+        if debug:
+            print("[DEBUG] failed to pre-build the cloth solvers", file=sys.stderr)
+            import traceback
+
+            print(traceback.format_exc(), file=sys.stderr)
+        failed += 1
+
+    try:
+        if debug:
+            print("[DEBUG] building the pathfinding search")
+
+        from PygameHaze.utils.pathfinding import build_pathfinding_numba
+
+        build_pathfinding_numba()
+
+        if debug:
+            print("[DEBUG] successfully built the pathfinding search")
+    except Exception:
+        if debug:
+            print("[DEBUG] failed to pre-build the pathfinding search", file=sys.stderr)
+            import traceback
+
+            print(traceback.format_exc(), file=sys.stderr)
+        failed += 1
+
     return failed
 
 
@@ -1,6 +1,8 @@
 from PygameHaze.utils.noise import noise
-from PygameHaze.utils.pathfinding import pathfinding
+from PygameHaze.utils.pathfinding import *
 from PygameHaze.utils.formulas import *
 from PygameHaze.utils.surface import *
 from PygameHaze.utils.utils import *
 from PygameHaze.utils.draw import *
+from PygameHaze.utils.spatial import *
+from PygameHaze.utils.timestep import *
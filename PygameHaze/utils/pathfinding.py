@@ -25,9 +25,15 @@
 pathfinding from 1 point to another
 """
 
-from typing import List, Tuple, Generator, Union, Dict, Sequence, Set
+from typing import List, Tuple, Generator, Union, Dict, Sequence, Set, Optional
+from collections import OrderedDict
 
+from PygameHaze.utils import _numba_utils as nbu
+
+import numpy as np
+import heapq
 import queue
+import math
 
 
 Number = Union[int, float]
@@ -133,4 +139,1481 @@ def pathfinding(
     return []
 
 
-__all__ = ["pathfinding"]
+# the steps of the array based search, the first 4 in the same order as _ASPos.neighbors
+_STEPS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+_SQRT2 = math.sqrt(2)
+
+
+@nbu.njit(fastmath=False, inline="always")
+def _heuristic(di: int, dj: int, diagonal: bool, scale: float) -> float:
+    # manhattan for 4 moves and octile for 8 moves, scaled by the cheapest cell
+    di = abs(di)
+    dj = abs(dj)
+    if diagonal:
+        return (max(di, dj) + (_SQRT2 - 1) * min(di, dj)) * scale
+    return (di + dj) * scale
+
+
+# fastmath is turned off because the walls are inf
+@nbu.njit(fastmath=False)
+def _astar_search(
+    costs: nbu.Array(float, 1),
+    rows: int,
+    cols: int,
+    start: int,
+    end: int,
+    diagonal: bool,
+    cut_corners: bool,
+    scale: float,
+    g_score: nbu.Array(float, 1),
+    parents: nbu.Array(int, 1),
+    stamps: nbu.Array(int, 1),
+    generation: int,
+) -> int:
+    # A* over the flat grid, moving into a cell costs its value (walls are inf) and
+    # diagonal moves cost sqrt(2) times more, the g_score and the parent of a cell are
+    # only valid when its stamp is the generation of the search so the buffers never
+    # have to be cleared, it returns the amount of expanded cells and the end is
+    # reached if it is stamped (an end of -1 with a scale of 0 is dijkstra from the
+    # start to every cell)
+    end_i = end // cols
+    end_j = end % cols
+    g_score[start] = 0.0
+    parents[start] = -1
+    stamps[start] = generation
+    h = _heuristic(start // cols - end_i, start % cols - end_j, diagonal, scale)
+    # ties are broken by the lower heuristic so the cells closer to the end go first
+    open_set = [(h, h, start)]
+    steps = 8 if diagonal else 4
+    expanded = 0
+    while len(open_set):
+        f, h, current = heapq.heappop(open_set)
+        g = g_score[current]
+        if g + h < f:  # an old entry, the cell was pushed again with a lower score
+            continue
+        if current == end:
+            break
+        expanded += 1
+        i = current // cols
+        j = current % cols
+        for k in range(steps):
+            di, dj = _STEPS[k]
+            ni = i + di
+            nj = j + dj
+            if ni < 0 or ni >= rows or nj < 0 or nj >= cols:
+                continue
+            neighbor = ni * cols + nj
+            cost = costs[neighbor]
+            if cost == np.inf:
+                continue
+            if k >= 4:
+                # the two cells next to a diagonal move, without cut_corners both of them
+                # must be free and with it at least one of them (it never squeezes between walls)
+                side_a = costs[ni * cols + j] != np.inf
+                side_b = costs[i * cols + nj] != np.inf
+                if cut_corners:
+                    if not (side_a or side_b):
+                        continue
+                elif not (side_a and side_b):
+                    continue
+                cost *= _SQRT2
+            new_g = g + cost
+            if stamps[neighbor] == generation and g_score[neighbor] <= new_g:
+                continue
+            g_score[neighbor] = new_g
+            parents[neighbor] = current
+            stamps[neighbor] = generation
+            h = _heuristic(ni - end_i, nj - end_j, diagonal, scale)
+            heapq.heappush(open_set, (new_g + h, h, neighbor))
+    return expanded
+
+
+@nbu.njit(fastmath=False, inline="always")
+def _free(costs: nbu.Array(float, 1), rows: int, cols: int, i: int, j: int) -> bool:
+    return 0 <= i < rows and 0 <= j < cols and costs[i * cols + j] != np.inf
+
+
+def _line_jumps(line: np.ndarray, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    # the straight jumps along every line (a row of the arrays) in the + direction,
+    # left and right are the free cells of the lines next to it, a cell has a forced
+    # neighbor when a cell next to it is free but the one behind that is a wall, it
+    # returns the distance to the first jump point or -1 - the distance to the first wall
+    count, n = line.shape
+    behind_left = np.zeros_like(left)
+    behind_left[:, 1:] = left[:, :-1]
+    behind_right = np.zeros_like(right)
+    behind_right[:, 1:] = right[:, :-1]
+    forced = (left & ~behind_left) | (right & ~behind_right)
+    positions = np.arange(n)
+    first = np.where(~line | forced, positions, n)
+    first = np.minimum.accumulate(first[:, ::-1], axis=1)[:, ::-1]
+    distance = first - positions
+    jump_point = np.take_along_axis(np.pad(line, ((0, 0), (0, 1))), first, axis=1)
+    return np.where(jump_point, distance, -distance - 1).astype(np.int32)
+
+
+def _update_jumps(
+    jumps: np.ndarray, free: np.ndarray, row_range: range, col_range: range
+) -> None:
+    # it recalculates the jumps of the rows and the columns in the ranges,
+    # jumps is (4, rows, cols) in the order of _STEPS and free is padded by a wall
+    rows = free[row_range.start + 1 : row_range.stop + 1, 1:-1]
+    left = free[row_range.start : row_range.stop, 1:-1]
+    right = free[row_range.start + 2 : row_range.stop + 2, 1:-1]
+    jumps[2, row_range.start : row_range.stop] = _line_jumps(rows, left, right)
+    jumps[3, row_range.start : row_range.stop] = _line_jumps(
+        rows[:, ::-1], left[:, ::-1], right[:, ::-1]
+    )[:, ::-1]
+    cols = free[1:-1, col_range.start + 1 : col_range.stop + 1].T
+    left = free[1:-1, col_range.start : col_range.stop].T
+    right = free[1:-1, col_range.start + 2 : col_range.stop + 2].T
+    jumps[0, :, col_range.start : col_range.stop] = _line_jumps(cols, left, right).T
+    jumps[1, :, col_range.start : col_range.stop] = _line_jumps(
+        cols[:, ::-1], left[:, ::-1], right[:, ::-1]
+    )[:, ::-1].T
+
+
+@nbu.njit(fastmath=False, inline="always")
+def _jump_line(
+    jumps: nbu.Array(nbu.int32, 1),
+    rows: int,
+    cols: int,
+    i: int,
+    j: int,
+    di: int,
+    dj: int,
+    end: int,
+) -> int:
+    # the next jump point in a straight line from the precalculated jumps (or the end
+    # if it is on the way), -1 if it reaches a wall first
+    if i < 0 or i >= rows or j < 0 or j >= cols:
+        return -1
+    direction = (0 if di == 1 else 1) if di != 0 else (2 if dj == 1 else 3)
+    jump = jumps[direction * rows * cols + i * cols + j]
+    # the last cell that can be reached, the jump point or the cell before the wall
+    reach = jump if jump >= 0 else -jump - 2
+    steps = -1
+    if di != 0 and end % cols == j:
+        steps = (end // cols - i) * di
+    elif dj != 0 and end // cols == i:
+        steps = (end % cols - j) * dj
+    if 0 <= steps <= reach:
+        return end
+    if jump >= 0:
+        return (i + di * jump) * cols + j + dj * jump
+    return -1
+
+
+@nbu.njit(fastmath=False)
+def _jump(
+    costs: nbu.Array(float, 1),
+    jumps: nbu.Array(nbu.int32, 1),
+    rows: int,
+    cols: int,
+    i: int,
+    j: int,
+    di: int,
+    dj: int,
+    end: int,
+    diagonal: bool,
+) -> int:
+    # the next jump point in a direction, diagonal moves (and the moves along the rows
+    # without diagonal moves) stop where a straight jump to the sides finds a jump point
+    if di == 0 or (diagonal and dj == 0):
+        return _jump_line(jumps, rows, cols, i, j, di, dj, end)
+    direction = 0 if di == 1 else 1
+    while _free(costs, rows, cols, i, j):
+        if i * cols + j == end:
+            return i * cols + j
+        if diagonal:
+            if (
+                _jump_line(jumps, rows, cols, i + di, j, di, 0, end) != -1
+                or _jump_line(jumps, rows, cols, i, j + dj, 0, dj, end) != -1
+            ):
+                return i * cols + j
+            # it never cuts a corner so both cells next to the move must be free
+            if not (
+                _free(costs, rows, cols, i + di, j)
+                and _free(costs, rows, cols, i, j + dj)
+            ):
+                return -1
+        elif (
+            jumps[direction * rows * cols + i * cols + j] == 0  # a forced neighbor
+            or _jump_line(jumps, rows, cols, i, j + 1, 0, 1, end) != -1
+            or _jump_line(jumps, rows, cols, i, j - 1, 0, -1, end) != -1
+        ):
+            return i * cols + j
+        i += di
+        j += dj
+    return -1
+
+
+@nbu.njit(fastmath=False, inline="always")
+def _natural(
+    costs: nbu.Array(float, 1),
+    rows: int,
+    cols: int,
+    i: int,
+    j: int,
+    pi: int,
+    pj: int,
+    di: int,
+    dj: int,
+    diagonal: bool,
+) -> bool:
+    # if the direction (di, dj) has to be searched from a jump point that was reached
+    # moving in the direction (pi, pj), (0, 0) for the start
+    if di != 0 and dj != 0:
+        if not (
+            _free(costs, rows, cols, i + di, j) and _free(costs, rows, cols, i, j + dj)
+        ):
+            return False
+        if pi == 0 and pj == 0:
+            return True
+        if pi != 0 and pj != 0:
+            return di == pi and dj == pj
+        # a straight move turns diagonally forward only
+        return di == pi if pi != 0 else dj == pj
+    if pi == 0 and pj == 0:
+        return True
+    if pi != 0 and pj != 0:
+        return di == pi or dj == pj
+    # a straight move never goes back
+    return not (di == -pi and dj == -pj)
+
+
+# fastmath is turned off because the walls are inf
+@nbu.njit(fastmath=False)
+def _jps_search(
+    costs: nbu.Array(float, 1),
+    jumps: nbu.Array(nbu.int32, 1),
+    rows: int,
+    cols: int,
+    start: int,
+    end: int,
+    diagonal: bool,
+    g_score: nbu.Array(float, 1),
+    parents: nbu.Array(int, 1),
+    stamps: nbu.Array(int, 1),
+    generation: int,
+) -> int:
+    # jump point search for a grid where every free cell costs 1, it only pushes the
+    # jump points so the parents are the previous jump point and not the previous cell,
+    # the straight jumps are precalculated so a jump costs one step for every diagonal cell
+    end_i = end // cols
+    end_j = end % cols
+    g_score[start] = 0.0
+    parents[start] = -1
+    stamps[start] = generation
+    h = _heuristic(start // cols - end_i, start % cols - end_j, diagonal, 1.0)
+    open_set = [(h, h, start)]
+    steps = 8 if diagonal else 4
+    expanded = 0
+    while len(open_set):
+        f, h, current = heapq.heappop(open_set)
+        g = g_score[current]
+        if g + h < f:  # an old entry, the cell was pushed again with a lower score
+            continue
+        if current == end:
+            break
+        expanded += 1
+        i = current // cols
+        j = current % cols
+        pi = 0
+        pj = 0
+        if parents[current] != -1:
+            pi = np.sign(i - parents[current] // cols)
+            pj = np.sign(j - parents[current] % cols)
+        for k in range(steps):
+            di, dj = _STEPS[k]
+            if not _natural(costs, rows, cols, i, j, pi, pj, di, dj, diagonal):
+                continue
+            point = _jump(
+                costs, jumps, rows, cols, i + di, j + dj, di, dj, end, diagonal
+            )
+            if point == -1:
+                continue
+            new_g = g + _heuristic(point // cols - i, point % cols - j, diagonal, 1.0)
+            if stamps[point] == generation and g_score[point] <= new_g:
+                continue
+            g_score[point] = new_g
+            parents[point] = current
+            stamps[point] = generation
+            h = _heuristic(point // cols - end_i, point % cols - end_j, diagonal, 1.0)
+            heapq.heappush(open_set, (new_g + h, h, point))
+    return expanded
+
+
+# fastmath is turned off because the walls are inf
+@nbu.njit(fastmath=False)
+def _flow_search(
+    costs: nbu.Array(float, 1),
+    rows: int,
+    cols: int,
+    goals: nbu.Array(int, 1),
+    diagonal: bool,
+    cut_corners: bool,
+    distances: nbu.Array(float, 1),
+    next_cells: nbu.Array(int, 1),
+) -> None:
+    # dijkstra from the goals back to every cell, moving from a cell into the cell that it
+    # was reached from costs the cost of that cell so the distances are the costs of the
+    # paths to the closest goal and next_cells are the first step of these paths
+    open_set = [(0.0, goals[0])]
+    for goal in goals:
+        distances[goal] = 0.0
+        heapq.heappush(open_set, (0.0, goal))
+    steps = 8 if diagonal else 4
+    while len(open_set):
+        distance, current = heapq.heappop(open_set)
+        if distance > distances[current]:  # an old entry
+            continue
+        i = current // cols
+        j = current % cols
+        for k in range(steps):
+            di, dj = _STEPS[k]
+            ni = i + di
+            nj = j + dj
+            if ni < 0 or ni >= rows or nj < 0 or nj >= cols:
+                continue
+            neighbor = ni * cols + nj
+            if costs[neighbor] == np.inf:
+                continue
+            cost = costs[current]
+            if k >= 4:
+                side_a = costs[ni * cols + j] != np.inf
+                side_b = costs[i * cols + nj] != np.inf
+                if cut_corners:
+                    if not (side_a or side_b):
+                        continue
+                elif not (side_a and side_b):
+                    continue
+                cost *= _SQRT2
+            new_distance = distance + cost
+            if new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                next_cells[neighbor] = current
+                heapq.heappush(open_set, (new_distance, neighbor))
+
+
+def _trace_path(parents, start: int, end: int, cols: int) -> List[Tuple[int, int]]:
+    # from the parent of the end back to the start, like the path of pathfinding
+    path: List[Tuple[int, int]] = []
+    current = end
+    while current != start:
+        current = int(parents[current])
+        path.append(divmod(current, cols))
+    path.reverse()
+    return path
+
+
+def _trace_jump_path(
+    parents, start: int, end: int, cols: int
+) -> List[Tuple[int, int]]:
+    # the jump points are connected by straight or diagonal lines, so every cell
+    # between two of them is added to get the same path as the other searches
+    path: List[Tuple[int, int]] = []
+    current = end
+    while current != start:
+        parent = int(parents[current])
+        i, j = divmod(current, cols)
+        pi, pj = divmod(parent, cols)
+        di = (pi > i) - (pi < i)
+        dj = (pj > j) - (pj < j)
+        while (i, j) != (pi, pj):
+            i += di
+            j += dj
+            path.append((i, j))
+        current = parent
+    path.reverse()
+    return path
+
+
+def _grid_costs(grid: np.ndarray, weighted: bool) -> np.ndarray:
+    # the cost to move into every cell, the walls are inf
+    if not weighted:
+        return np.where(grid != 0, np.inf, 1.0).ravel()
+    costs = grid.astype(np.float64).ravel()
+    costs[~(costs >= 0)] = np.inf  # negative and nan cells are walls too
+    return costs
+
+
+def _cell_cost(value: float, weighted: bool) -> float:
+    if not weighted:
+        return math.inf if value != 0 else 1.0
+    value = float(value)
+    return value if value >= 0 else math.inf
+
+
+class PathGrid:
+    """
+    a grid that is prepared once for many searches, it keeps the walls and the buffers
+    of the search so every find only costs the search itself,
+    the stamps of the buffers are generation counters so they are never cleared between searches
+
+    Parameters:
+    -----------
+    grid: Union[np.ndarray, List[List[Union[int, float]]]]
+        the grid, if the value of a cell is 0 then the algorithm can go there, anything else is a wall
+    weighted: bool
+        the value of a cell is the cost to move into it instead, a negative or inf value is a wall
+    diagonal: bool
+        it can move diagonally too, a diagonal move costs sqrt(2) times the cost of the cell
+    cut_corners: bool
+        a diagonal move is allowed next to one wall, without it both cells next to the move must be free
+    search: str
+        "astar" for A* and "jps" for jump point search, it only pushes the cells where the path
+        could turn so it is a lot faster on open grids (it needs a grid that isnt weighted and no cut_corners)
+    cache_size: int
+        how many paths are kept (the least recently used are dropped first), 0 for no cache,
+        a path is kept until a cell of it becomes a wall (or more expensive) or any cell becomes free (or cheaper)
+
+    Attributes:
+    -----------
+    expanded: int
+        how many cells the last find expanded
+    revision: int
+        it goes up every time a cell changes
+    cache_hits: int
+        how many finds returned a kept path
+    cache_misses: int
+        how many finds had to search
+
+    Methods:
+    -----------
+    find(start, end):
+        it finds the most efficient path from start to end (the same path format as pathfinding)
+    clear_cache():
+        it drops every kept path
+    flow_field(goals):
+        it finds the distance to the closest goal and the direction to it for every cell
+    set_cell(i, j, value):
+        it changes a cell of the grid
+    set_grid(grid):
+        it replaces every cell of the grid (it must have the same size)
+    is_wall(i, j):
+        it returns True if the cell is a wall
+    """
+
+    def __init__(
+        self,
+        grid: Union[np.ndarray, List[List[Union[int, float]]]],
+        weighted: bool = False,
+        diagonal: bool = False,
+        cut_corners: bool = False,
+        search: str = "astar",
+        cache_size: int = 0,
+    ) -> None:
+        if search not in ("astar", "jps"):
+            raise ValueError(f'search must be "astar" or "jps" not {search!r}')
+        if search == "jps" and (weighted or cut_corners):
+            raise ValueError("jump point search needs a grid that isnt weighted and no cut_corners")
+        grid = np.asarray(grid)
+        self.rows: int
+        self.cols: int
+        self.rows, self.cols = grid.shape
+        self.weighted: bool = weighted
+        self.diagonal: bool = diagonal
+        self.cut_corners: bool = cut_corners
+        self.search: str = search
+        self.expanded: int = 0
+        size = self.rows * self.cols
+        self._costs = _grid_costs(grid, weighted)
+        self._scale: float = self._min_cost(self._costs)
+        self._g_score = np.empty(size, dtype=np.float64)
+        self._parents = np.empty(size, dtype=np.int64)
+        self._stamps = np.zeros(size, dtype=np.int64)
+        if not nbu.USE_NUMBA:
+            # python lists are a lot faster than numpy arrays one item at a time
+            self._costs = self._costs.tolist()
+            self._g_score = self._g_score.tolist()
+            self._parents = self._parents.tolist()
+            self._stamps = self._stamps.tolist()
+        self._generation: int = 0
+        # the straight jumps of jump point search, (4, rows, cols) in the order of _STEPS
+        self._jumps: Optional[np.ndarray] = None
+        self._jump_list: Optional[List[int]] = None
+        # the free cells padded by a wall, it is kept up to date so an edit doesnt go over the grid
+        self._free: Optional[np.ndarray] = None
+        if search == "jps":
+            self._jumps = np.empty((4, self.rows, self.cols), dtype=np.int32)
+            self._set_free()
+            self._update_jumps(range(self.rows), range(self.cols))
+        # the kept paths (start, end): (the revision that they were found at, the cells that
+        # they depend on, the path), a path is still the most efficient if no cell became
+        # cheaper after its revision and none of its cells became more expensive
+        self.revision: int = 0
+        self.cache_size: int = max(int(cache_size), 0)
+        self.cache_hits: int = 0
+        self.cache_misses: int = 0
+        self._cache: OrderedDict = OrderedDict()
+        # the last revision that each cell became more expensive at and that any cell became cheaper at
+        self._cell_revisions: Optional[np.ndarray] = None
+        if self.cache_size:
+            self._cell_revisions = np.zeros(size, dtype=np.int64)
+        self._cheaper_revision: int = 0
+
+    def _set_free(self) -> None:
+        free = np.asarray(self._costs).reshape(self.rows, self.cols) != np.inf
+        self._free = np.pad(free, 1)
+
+    def _update_jumps(self, row_range: range, col_range: range) -> None:
+        _update_jumps(self._jumps, self._free, row_range, col_range)
+        jump_list = self._jump_list
+        if jump_list is None:
+            return
+        # the python list of the search without numba only gets the lines that changed
+        rows, cols = self.rows, self.cols
+        size = rows * cols
+        for direction in (2, 3):
+            base = direction * size
+            for i in row_range:
+                start = base + i * cols
+                jump_list[start : start + cols] = self._jumps[direction, i].tolist()
+        for direction in (0, 1):
+            base = direction * size
+            for j in col_range:
+                column = self._jumps[direction, :, j].tolist()
+                jump_list[base + j : base + size : cols] = column
+
+    @staticmethod
+    def _min_cost(costs: np.ndarray) -> float:
+        # the heuristic is scaled by the cheapest cell so it never overestimates
+        free = costs[costs != np.inf]
+        return float(free.min()) if len(free) else 0.0
+
+    def _index(self, pos: Sequence[int]) -> int:
+        i, j = int(pos[0]), int(pos[1])
+        if not (0 <= i < self.rows and 0 <= j < self.cols):
+            raise IndexError(f"{(i, j)} is outside of the grid")
+        return i * self.cols + j
+
+    def is_wall(self, i: int, j: int) -> bool:
+        """
+        it returns True if the cell is a wall
+        :param i: int
+        :param j: int
+        :return: bool
+        """
+        return self._costs[self._index((i, j))] == math.inf
+
+    def set_cell(self, i: int, j: int, value: Union[int, float]) -> None:
+        """
+        it changes a cell of the grid, 0 is empty and anything else is a wall
+        (with weighted it is the cost of the cell and a negative or inf value is a wall)
+        :param i: int
+        :param j: int
+        :param value: Union[int, float]
+        :return: None
+        """
+        index = self._index((i, j))
+        cost = _cell_cost(value, self.weighted)
+        old = self._costs[index]
+        if cost == old:
+            return
+        self._costs[index] = cost
+        self.revision += 1
+        if cost > old:
+            if self._cell_revisions is not None:
+                self._cell_revisions[index] = self.revision
+        else:
+            self._cheaper_revision = self.revision
+        if cost < self._scale:
+            self._scale = cost
+        if self._jumps is not None:
+            # the cell changes the jumps of its lines and of the lines next to it
+            self._free[i + 1, j + 1] = cost != math.inf
+            self._update_jumps(
+                range(max(i - 1, 0), min(i + 2, self.rows)),
+                range(max(j - 1, 0), min(j + 2, self.cols)),
+            )
+
+    def set_grid(self, grid: Union[np.ndarray, List[List[Union[int, float]]]]) -> None:
+        """
+        it replaces every cell of the grid, the new grid must have the same size
+        :param grid: Union[np.ndarray, List[List[Union[int, float]]]]
+        :return: None
+        """
+        grid = np.asarray(grid)
+        if grid.shape != (self.rows, self.cols):
+            raise ValueError(
+                f"the grid must be {(self.rows, self.cols)} not {grid.shape}"
+            )
+        costs = _grid_costs(grid, self.weighted)
+        self._scale = self._min_cost(costs)
+        if nbu.USE_NUMBA:
+            self._costs[:] = costs
+        else:
+            self._costs[:] = costs.tolist()
+        if self._jumps is not None:
+            self._set_free()
+            self._jump_list = None
+            self._update_jumps(range(self.rows), range(self.cols))
+        self.revision += 1
+        self._cheaper_revision = self.revision
+        self._cache.clear()
+
+    def clear_cache(self) -> None:
+        """
+        it drops every kept path
+        :return: None
+        """
+        self._cache.clear()
+
+    def _cached(self, key: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        revision, cells, path = entry
+        if revision < self._cheaper_revision or (
+            len(cells) and self._cell_revisions[cells].max() > revision
+        ):
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return path
+
+    def _keep(self, key: Tuple[int, int], path: List[Tuple[int, int]]) -> None:
+        # the cells of the path and the end, and the cells next to its diagonal moves
+        # because a wall there blocks the move
+        if path:
+            points = np.array(path + [divmod(key[1], self.cols)], dtype=np.int64)
+            cells = [points[:, 0] * self.cols + points[:, 1]]
+            diagonal = (points[1:, 0] != points[:-1, 0]) & (points[1:, 1] != points[:-1, 1])
+            if diagonal.any():
+                before = points[:-1][diagonal]
+                after = points[1:][diagonal]
+                cells.append(after[:, 0] * self.cols + before[:, 1])
+                cells.append(before[:, 0] * self.cols + after[:, 1])
+            cells = np.concatenate(cells)
+        else:
+            # increases never make a path, only a cheaper cell can
+            cells = np.empty(0, dtype=np.int64)
+        self._cache[key] = (self.revision, cells, path)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def find(
+        self,
+        start: Union[List[int], Tuple[int, int], Sequence[int]],
+        end: Union[List[int], Tuple[int, int], Sequence[int]],
+    ) -> List[Tuple[int, int]]:
+        """
+        it finds the most efficient path from start to end
+        the path starts with the start and it doesnt have the end, an empty list means that there is no path
+        :param start: Sequence[int]
+        :param end: Sequence[int]
+        :return: List[Tuple[int, int]]
+        """
+        start = self._index(start)
+        end = self._index(end)
+        if start == end:
+            return []
+        if not self.cache_size:
+            return self._find(start, end)
+        path = self._cached((start, end))
+        if path is not None:
+            self.cache_hits += 1
+            self.expanded = 0
+            return list(path)
+        self.cache_misses += 1
+        path = self._find(start, end)
+        self._keep((start, end), path)
+        return list(path)
+
+    def _find(self, start: int, end: int) -> List[Tuple[int, int]]:
+        self._generation += 1
+        if self.search == "jps":
+            jumps = self._jumps.ravel()
+            if not nbu.USE_NUMBA:
+                if self._jump_list is None:
+                    self._jump_list = jumps.tolist()
+                jumps = self._jump_list
+            self.expanded = _jps_search(
+                self._costs,
+                jumps,
+                self.rows,
+                self.cols,
+                start,
+                end,
+                self.diagonal,
+                self._g_score,
+                self._parents,
+                self._stamps,
+                self._generation,
+            )
+        else:
+            self.expanded = _astar_search(
+                self._costs,
+                self.rows,
+                self.cols,
+                start,
+                end,
+                self.diagonal,
+                self.cut_corners,
+                self._scale,
+                self._g_score,
+                self._parents,
+                self._stamps,
+                self._generation,
+            )
+        if self._stamps[end] != self._generation:
+            return []
+        if self.search == "jps":
+            return _trace_jump_path(self._parents, start, end, self.cols)
+        return _trace_path(self._parents, start, end, self.cols)
+
+    def flow_field(
+        self, goals: Union[Sequence[int], Sequence[Sequence[int]]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        it finds the paths from every cell to the closest goal at once, so many agents
+        that go to the same goals only look up their next step
+        the distances are the costs of the paths to the closest goal (inf if there is no path)
+        and the directions are the (di, dj) step of every cell on its path ((0, 0) on the goals
+        and the cells without a path), for example: i + directions[i, j, 0], j + directions[i, j, 1]
+        :param goals: Union[Sequence[int], Sequence[Sequence[int]]] a goal or a list of goals
+        :return: Tuple[np.ndarray, np.ndarray] distances (rows, cols), directions (rows, cols, 2)
+        """
+        if len(goals) and np.ndim(goals[0]) == 0:
+            goals = [goals]
+        costs = self._costs
+        # the goals in walls cant be reached
+        goals = np.array(
+            [index for index in map(self._index, goals) if costs[index] != math.inf],
+            dtype=np.int64,
+        )
+        size = self.rows * self.cols
+        distances = np.full(size, np.inf)
+        next_cells = np.full(size, -1, dtype=np.int64)
+        if len(goals):
+            if nbu.USE_NUMBA:
+                _flow_search(
+                    costs,
+                    self.rows,
+                    self.cols,
+                    goals,
+                    self.diagonal,
+                    self.cut_corners,
+                    distances,
+                    next_cells,
+                )
+            else:
+                # python lists are a lot faster than numpy arrays one item at a time
+                distance_list = distances.tolist()
+                next_list = next_cells.tolist()
+                _flow_search(
+                    costs,
+                    self.rows,
+                    self.cols,
+                    goals.tolist(),
+                    self.diagonal,
+                    self.cut_corners,
+                    distance_list,
+                    next_list,
+                )
+                distances = np.array(distance_list)
+                next_cells = np.array(next_list, dtype=np.int64)
+
+        cells = np.arange(size)
+        next_cells = np.where(next_cells == -1, cells, next_cells)
+        directions = np.empty((self.rows, self.cols, 2), dtype=np.int8)
+        directions[..., 0] = (next_cells // self.cols - cells // self.cols).reshape(
+            self.rows, self.cols
+        )
+        directions[..., 1] = (next_cells % self.cols - cells % self.cols).reshape(
+            self.rows, self.cols
+        )
+        return distances.reshape(self.rows, self.cols), directions
+
+    def _fill(self, start: int) -> None:
+        # the cost from start to every cell that it can reach (dijkstra with A*)
+        self._generation += 1
+        self.expanded = _astar_search(
+            self._costs,
+            self.rows,
+            self.cols,
+            start,
+            -1,
+            self.diagonal,
+            self.cut_corners,
+            0.0,
+            self._g_score,
+            self._parents,
+            self._stamps,
+            self._generation,
+        )
+
+    def _cost_to(self, index: int) -> float:
+        # the cost of the path to a cell from the last search, inf if it wasnt reached
+        if self._stamps[index] != self._generation:
+            return math.inf
+        return float(self._g_score[index])
+
+
+# fastmath is turned off because the missing edges are inf
+@nbu.njit(fastmath=False)
+def _abstract_search(
+    node_cells: nbu.Array(int, 2),
+    node_count: nbu.Array(int, 1),
+    intra: nbu.Array(float, 3),
+    inter: nbu.Array(int, 3),
+    inter_cost: nbu.Array(float, 3),
+    cols: int,
+    start_cell: int,
+    end_cell: int,
+    start_cluster: int,
+    end_cluster: int,
+    from_start: nbu.Array(float, 1),
+    to_end: nbu.Array(float, 1),
+    diagonal: bool,
+    scale: float,
+    g_score: nbu.Array(float, 1),
+    parents: nbu.Array(int, 1),
+    stamps: nbu.Array(int, 1),
+    generation: int,
+) -> int:
+    # A* over the entrances of the clusters, the entrance k of the cluster c is the node
+    # c * M + k and the start and the end are the two nodes after them, the start is
+    # connected to the entrances of its cluster with from_start (the last one is the end)
+    # and the entrances of the cluster of the end are connected to it with to_end
+    slots = node_cells.shape[1]
+    start = node_cells.shape[0] * slots
+    end = start + 1
+    end_i = end_cell // cols
+    end_j = end_cell % cols
+    g_score[start] = 0.0
+    parents[start] = -1
+    stamps[start] = generation
+    h = _heuristic(start_cell // cols - end_i, start_cell % cols - end_j, diagonal, scale)
+    open_set = [(h, h, start)]
+    expanded = 0
+    while len(open_set):
+        f, h, current = heapq.heappop(open_set)
+        g = g_score[current]
+        if g + h < f:  # an old entry, the node was pushed again with a lower score
+            continue
+        if current == end:
+            break
+        expanded += 1
+        if current == start:
+            cluster = start_cluster
+            k = 0
+            count = node_count[cluster]
+            edges = count + 1
+        else:
+            cluster = current // slots
+            k = current % slots
+            count = node_count[cluster]
+            edges = count + 3
+        for e in range(edges):
+            # the entrances of the cluster, the moves out of it and the end
+            if current == start:
+                if e < count:
+                    node = cluster * slots + e
+                    cost = from_start[e]
+                else:
+                    node = end
+                    cost = from_start[slots]
+            elif e < count:
+                node = cluster * slots + e
+                cost = intra[cluster, k, e]
+            elif e < count + 2:
+                node = inter[cluster, k, e - count]
+                if node == -1:
+                    continue
+                cost = inter_cost[cluster, k, e - count]
+            else:
+                node = end
+                cost = to_end[k] if cluster == end_cluster else np.inf
+            if cost == np.inf:
+                continue
+            new_g = g + cost
+            if stamps[node] == generation and g_score[node] <= new_g:
+                continue
+            g_score[node] = new_g
+            parents[node] = current
+            stamps[node] = generation
+            cell = end_cell if node == end else node_cells[node // slots, node % slots]
+            h = _heuristic(cell // cols - end_i, cell % cols - end_j, diagonal, scale)
+            heapq.heappush(open_set, (new_g + h, h, node))
+    return expanded
+
+
+class HierarchicalPathGrid:
+    """
+    a hierarchical planner (HPA*) for big grids, the grid is split into clusters and the
+    free cells on the borders of the clusters are the entrances, the costs between the
+    entrances of every cluster are calculated once and kept, a search goes over the
+    entrances and only the clusters of the path are searched cell by cell (the paths
+    are close to the most efficient ones but not always the most efficient),
+    when a cell changes only its cluster (and the clusters next to it if the entrances
+    of their border changed) are calculated again
+
+    Parameters:
+    -----------
+    grid: Union[np.ndarray, List[List[Union[int, float]]]]
+        the grid, if the value of a cell is 0 then the algorithm can go there, anything else is a wall
+    cluster_size: int
+        the width and the height of the clusters in cells
+    weighted: bool
+        the value of a cell is the cost to move into it instead, a negative or inf value is a wall
+    diagonal: bool
+        it can move diagonally too, a diagonal move costs sqrt(2) times the cost of the cell
+    cut_corners: bool
+        a diagonal move is allowed next to one wall, without it both cells next to the move must be free
+
+    Attributes:
+    -----------
+    expanded: int
+        how many entrances the last find expanded
+
+    Methods:
+    -----------
+    find(start, end):
+        it finds a path from start to end (the same path format as pathfinding)
+    set_cell(i, j, value):
+        it changes a cell of the grid, its cluster is calculated again on the next find
+    set_grid(grid):
+        it replaces every cell of the grid (it must have the same size)
+    is_wall(i, j):
+        it returns True if the cell is a wall
+    """
+
+    def __init__(
+        self,
+        grid: Union[np.ndarray, List[List[Union[int, float]]]],
+        cluster_size: int = 16,
+        weighted: bool = False,
+        diagonal: bool = False,
+        cut_corners: bool = False,
+    ) -> None:
+        if cluster_size < 2:
+            raise ValueError(f"the cluster size must be at least 2 not {cluster_size}")
+        grid = np.asarray(grid)
+        self.rows: int
+        self.cols: int
+        self.rows, self.cols = grid.shape
+        self.cluster_size: int = int(cluster_size)
+        self.weighted: bool = weighted
+        self.diagonal: bool = diagonal
+        self.cut_corners: bool = cut_corners
+        self.expanded: int = 0
+        self._cluster_rows: int = -(-self.rows // self.cluster_size)
+        self._cluster_cols: int = -(-self.cols // self.cluster_size)
+        self._set_costs(grid)
+
+    def _set_costs(self, grid: np.ndarray) -> None:
+        self._costs: np.ndarray = _grid_costs(grid, self.weighted).reshape(
+            self.rows, self.cols
+        )
+        self._scale: float = PathGrid._min_cost(self._costs)
+        size = self.cluster_size
+        clusters = self._cluster_rows * self._cluster_cols
+        # every cluster has its own grid for the searches inside of it
+        self._grids: List[PathGrid] = [
+            PathGrid(
+                self._costs[cr * size : (cr + 1) * size, cc * size : (cc + 1) * size],
+                True,
+                self.diagonal,
+                self.cut_corners,
+            )
+            for cr in range(self._cluster_rows)
+            for cc in range(self._cluster_cols)
+        ]
+        # the pairs of cells (this side, the other side) of the entrances of every border,
+        # (0, cr, cc) is the border below the cluster (cr, cc) and (1, cr, cc) the one on its right
+        self._borders: Dict[Tuple[int, int, int], List[Tuple[int, int]]] = {}
+        # the paths between the entrances of every cluster that were already refined
+        self._paths: List[Dict[Tuple[int, int], List[Tuple[int, int]]]] = [
+            {} for _ in range(clusters)
+        ]
+        # every cluster has the same amount of slots for its entrances (the most that a
+        # cluster has), the cell of every entrance, the costs between the entrances of a
+        # cluster and the (up to 2) moves out of the cluster of every entrance
+        self._slots: int = 0
+        self._node_cells: np.ndarray = np.full((clusters, 0), -1, dtype=np.int64)
+        self._node_count: np.ndarray = np.zeros(clusters, dtype=np.int64)
+        self._intra: np.ndarray = np.empty((clusters, 0, 0), dtype=np.float64)
+        self._inter: np.ndarray = np.empty((clusters, 0, 2), dtype=np.int64)
+        self._inter_cost: np.ndarray = np.empty((clusters, 0, 2), dtype=np.float64)
+        self._resize(1)
+        self._dirty_clusters: Set[int] = set(range(clusters))
+        self._dirty_borders: Set[Tuple[int, int, int]] = {
+            (axis, cr, cc)
+            for axis in (0, 1)
+            for cr in range(self._cluster_rows - (axis == 0))
+            for cc in range(self._cluster_cols - (axis == 1))
+        }
+
+    def _resize(self, slots: int) -> None:
+        # more slots for the entrances of every cluster, the nodes of the moves out of
+        # the clusters are moved to their new slots
+        clusters, old = self._node_cells.shape
+        node_cells = np.full((clusters, slots), -1, dtype=np.int64)
+        node_cells[:, :old] = self._node_cells
+        intra = np.full((clusters, slots, slots), np.inf)
+        intra[:, :old, :old] = self._intra
+        inter = np.full((clusters, slots, 2), -1, dtype=np.int64)
+        moved = self._inter
+        if old:
+            moved = np.where(moved == -1, -1, moved // old * slots + moved % old)
+        inter[:, :old] = moved
+        inter_cost = np.full((clusters, slots, 2), np.inf)
+        inter_cost[:, :old] = self._inter_cost
+        self._node_cells = node_cells
+        self._intra = intra
+        self._inter = inter
+        self._inter_cost = inter_cost
+        self._slots = slots
+        # the buffers of the search, the last two nodes are the start and the end
+        self._g_score = np.empty(clusters * slots + 2, dtype=np.float64)
+        self._parents = np.empty(clusters * slots + 2, dtype=np.int64)
+        self._stamps = np.zeros(clusters * slots + 2, dtype=np.int64)
+        self._generation: int = 0
+
+    def _index(self, pos: Sequence[int]) -> int:
+        i, j = int(pos[0]), int(pos[1])
+        if not (0 <= i < self.rows and 0 <= j < self.cols):
+            raise IndexError(f"{(i, j)} is outside of the grid")
+        return i * self.cols + j
+
+    def _cluster(self, index: int) -> int:
+        return (
+            index // self.cols // self.cluster_size * self._cluster_cols
+            + index % self.cols // self.cluster_size
+        )
+
+    def _local(self, index: int, cluster: int) -> int:
+        # the index of a cell in the grid of its cluster
+        grid = self._grids[cluster]
+        i = index // self.cols - cluster // self._cluster_cols * self.cluster_size
+        j = index % self.cols - cluster % self._cluster_cols * self.cluster_size
+        return i * grid.cols + j
+
+    def _cluster_borders(self, cluster: int) -> List[Tuple[Tuple[int, int, int], int]]:
+        # the borders of a cluster and the side of the border that it is on
+        cr, cc = divmod(cluster, self._cluster_cols)
+        borders = []
+        if cr + 1 < self._cluster_rows:
+            borders.append(((0, cr, cc), 0))
+        if cr > 0:
+            borders.append(((0, cr - 1, cc), 1))
+        if cc + 1 < self._cluster_cols:
+            borders.append(((1, cr, cc), 0))
+        if cc > 0:
+            borders.append(((1, cr, cc - 1), 1))
+        return borders
+
+    def _entrances(self, border: Tuple[int, int, int]) -> List[Tuple[int, int]]:
+        # the pairs of free cells on the two sides of the border are split into runs,
+        # a short run gets one entrance in its middle and a long one an entrance at both ends
+        axis, cr, cc = border
+        size = self.cluster_size
+        cols = self.cols
+        if axis == 0:
+            i = (cr + 1) * size - 1
+            pairs = [
+                (i * cols + j, (i + 1) * cols + j)
+                for j in range(cc * size, min((cc + 1) * size, cols))
+            ]
+        else:
+            j = (cc + 1) * size - 1
+            pairs = [
+                (i * cols + j, i * cols + j + 1)
+                for i in range(cr * size, min((cr + 1) * size, self.rows))
+            ]
+        costs = self._costs.ravel()
+        entrances: List[Tuple[int, int]] = []
+        run: List[Tuple[int, int]] = []
+        for a, b in pairs + [(-1, -1)]:
+            if a != -1 and costs[a] != math.inf and costs[b] != math.inf:
+                run.append((a, b))
+                continue
+            if len(run) >= 6:
+                entrances.extend((run[0], run[-1]))
+            elif run:
+                entrances.append(run[len(run) // 2])
+            run = []
+        return entrances
+
+    def _cluster_nodes(self, cluster: int) -> List[int]:
+        # the cells of the entrances of a cluster (a cell in a corner can be on two borders)
+        nodes: Dict[int, None] = {}
+        for border, side in self._cluster_borders(cluster):
+            for pair in self._borders[border]:
+                nodes[pair[side]] = None
+        return list(nodes)
+
+    def _build_cluster(self, cluster: int, nodes: List[int]) -> None:
+        # the costs between the entrances of the cluster
+        count = len(nodes)
+        self._node_cells[cluster] = -1
+        self._node_cells[cluster, :count] = nodes
+        self._node_count[cluster] = count
+        intra = self._intra[cluster]
+        intra[:] = np.inf
+        grid = self._grids[cluster]
+        local = [self._local(node, cluster) for node in nodes]
+        for k, start in enumerate(local):
+            grid._fill(start)
+            for other in range(count):
+                if other != k:
+                    intra[k, other] = grid._cost_to(local[other])
+        self._paths[cluster] = {}
+
+    def _link(self, cluster: int) -> None:
+        # the moves out of the cluster, from an entrance to the entrance on the other side
+        self._inter[cluster] = -1
+        self._inter_cost[cluster] = np.inf
+        costs = self._costs.ravel()
+        slots = self._slots
+        for border, side in self._cluster_borders(cluster):
+            for pair in self._borders[border]:
+                a, b = pair[side], pair[1 - side]
+                k = self._slot(cluster, a)
+                other = self._cluster(b)
+                e = 0 if self._inter[cluster, k, 0] == -1 else 1
+                self._inter[cluster, k, e] = other * slots + self._slot(other, b)
+                self._inter_cost[cluster, k, e] = costs[b]
+
+    def _slot(self, cluster: int, cell: int) -> int:
+        return int(np.flatnonzero(self._node_cells[cluster] == cell)[0])
+
+    def _rebuild(self) -> None:
+        # the borders of the changed cells first, a border with different entrances
+        # changes the clusters on both of its sides, and the moves over a border with the
+        # same entrances are linked again on both sides because their costs can be different
+        relink = set()
+        for border in self._dirty_borders:
+            axis, cr, cc = border
+            cluster = cr * self._cluster_cols + cc
+            other = cluster + (self._cluster_cols if axis == 0 else 1)
+            relink.update((cluster, other))
+            entrances = self._entrances(border)
+            if entrances != self._borders.get(border):
+                self._borders[border] = entrances
+                self._dirty_clusters.update((cluster, other))
+        self._dirty_borders.clear()
+        if not self._dirty_clusters:
+            for cluster in relink:
+                self._link(cluster)
+            return
+        nodes = {cluster: self._cluster_nodes(cluster) for cluster in self._dirty_clusters}
+        slots = max(len(cells) for cells in nodes.values())
+        if slots > self._slots:
+            self._resize(slots)
+        # the clusters next to a cluster with different entrances move to them in new slots
+        for cluster, cells in nodes.items():
+            count = self._node_count[cluster]
+            if self._node_cells[cluster, :count].tolist() != cells:
+                relink.update(
+                    self._cluster(pair[1 - side])
+                    for border, side in self._cluster_borders(cluster)
+                    for pair in self._borders[border]
+                )
+            relink.add(cluster)
+            self._build_cluster(cluster, cells)
+        for cluster in relink:
+            self._link(cluster)
+        self._dirty_clusters.clear()
+
+    def is_wall(self, i: int, j: int) -> bool:
+        """
+        it returns True if the cell is a wall
+        :param i: int
+        :param j: int
+        :return: bool
+        """
+        return self._costs.ravel()[self._index((i, j))] == math.inf
+
+    def set_cell(self, i: int, j: int, value: Union[int, float]) -> None:
+        """
+        it changes a cell of the grid, 0 is empty and anything else is a wall
+        (with weighted it is the cost of the cell and a negative or inf value is a wall),
+        its cluster is calculated again on the next find
+        :param i: int
+        :param j: int
+        :param value: Union[int, float]
+        :return: None
+        """
+        cluster = self._cluster(self._index((i, j)))
+        cost = _cell_cost(value, self.weighted)
+        self._costs[i, j] = cost
+        if cost < self._scale:
+            self._scale = cost
+        size = self.cluster_size
+        self._grids[cluster].set_cell(i % size, j % size, cost)
+        self._dirty_clusters.add(cluster)
+        for border, _ in self._cluster_borders(cluster):
+            axis, cr, cc = border
+            # the last line of cells before the border, the first after it is the next one
+            line = ((cr if axis == 0 else cc) + 1) * size - 1
+            if (i if axis == 0 else j) in (line, line + 1):
+                self._dirty_borders.add(border)
+
+    def set_grid(self, grid: Union[np.ndarray, List[List[Union[int, float]]]]) -> None:
+        """
+        it replaces every cell of the grid, the new grid must have the same size
+        :param grid: Union[np.ndarray, List[List[Union[int, float]]]]
+        :return: None
+        """
+        grid = np.asarray(grid)
+        if grid.shape != (self.rows, self.cols):
+            raise ValueError(
+                f"the grid must be {(self.rows, self.cols)} not {grid.shape}"
+            )
+        self._set_costs(grid)
+
+    def find(
+        self,
+        start: Union[List[int], Tuple[int, int], Sequence[int]],
+        end: Union[List[int], Tuple[int, int], Sequence[int]],
+    ) -> List[Tuple[int, int]]:
+        """
+        it finds a path from start to end over the entrances of the clusters
+        the path starts with the start and it doesnt have the end, an empty list means that there is no path
+        :param start: Sequence[int]
+        :param end: Sequence[int]
+        :return: List[Tuple[int, int]]
+        """
+        start = self._index(start)
+        end = self._index(end)
+        self.expanded = 0
+        if start == end:
+            return []
+        self._rebuild()
+        costs = self._costs.ravel()
+        if costs[end] == math.inf:
+            return []
+        if costs[start] != math.inf:
+            nodes, _ = self._abstract_path(start, end)
+            return self._refine(nodes, start, end) if nodes else []
+
+        # a start in a wall isnt an entrance, so the path from every cell that it can
+        # step into is found and the cheapest one is used
+        best: List[Tuple[int, int]] = []
+        best_cost = math.inf
+        for cell, move in self._moves(start):
+            if cell == end:
+                nodes, cost = [end], 0.0
+            else:
+                nodes, cost = self._abstract_path(cell, end)
+            if nodes and move + cost < best_cost:
+                best_cost = move + cost
+                best = [divmod(start, self.cols)] + self._refine(nodes, cell, end)
+        return best
+
+    def _moves(self, index: int) -> List[Tuple[int, float]]:
+        # the cells that can be reached in one move and the cost of the move
+        costs = self._costs
+        i, j = divmod(index, self.cols)
+        moves = []
+        for di, dj in _STEPS[: 8 if self.diagonal else 4]:
+            ni, nj = i + di, j + dj
+            if not (0 <= ni < self.rows and 0 <= nj < self.cols):
+                continue
+            cost = costs[ni, nj]
+            if cost == math.inf:
+                continue
+            if di and dj:
+                side_a = costs[ni, j] != math.inf
+                side_b = costs[i, nj] != math.inf
+                if not ((side_a or side_b) if self.cut_corners else (side_a and side_b)):
+                    continue
+                cost *= _SQRT2
+            moves.append((ni * self.cols + nj, float(cost)))
+        return moves
+
+    def _abstract_path(self, start: int, end: int) -> Tuple[List[int], float]:
+        # the start and the end are connected to the entrances of their clusters and the
+        # entrances are searched, it returns the cells of the entrances of the path
+        # (with the start and the end) and its cost
+        costs = self._costs.ravel()
+        slots = self._slots
+        start_cluster = self._cluster(start)
+        end_cluster = self._cluster(end)
+        from_start = np.full(slots + 1, np.inf)
+        grid = self._grids[start_cluster]
+        grid._fill(self._local(start, start_cluster))
+        for k in range(self._node_count[start_cluster]):
+            node = int(self._node_cells[start_cluster, k])
+            from_start[k] = grid._cost_to(self._local(node, start_cluster))
+        if start_cluster == end_cluster:
+            from_start[slots] = grid._cost_to(self._local(end, end_cluster))
+        to_end = np.full(slots, np.inf)
+        grid = self._grids[end_cluster]
+        count = self._node_count[end_cluster]
+        if self.weighted and self.diagonal:
+            # the diagonal moves cost sqrt(2) times the cell that they go into, so the path
+            # back from the end doesnt cost the same and the paths to the end are searched
+            distances, _ = grid.flow_field(divmod(self._local(end, end_cluster), grid.cols))
+            for k in range(count):
+                node = int(self._node_cells[end_cluster, k])
+                to_end[k] = distances.flat[self._local(node, end_cluster)]
+        else:
+            # a path to the end costs the same as the path back without the end and with the entrance
+            grid._fill(self._local(end, end_cluster))
+            for k in range(count):
+                node = int(self._node_cells[end_cluster, k])
+                to_end[k] = (
+                    grid._cost_to(self._local(node, end_cluster)) - costs[node] + costs[end]
+                )
+
+        self._generation += 1
+        self.expanded += _abstract_search(
+            self._node_cells,
+            self._node_count,
+            self._intra,
+            self._inter,
+            self._inter_cost,
+            self.cols,
+            start,
+            end,
+            start_cluster,
+            end_cluster,
+            from_start,
+            to_end,
+            self.diagonal,
+            self._scale,
+            self._g_score,
+            self._parents,
+            self._stamps,
+            self._generation,
+        )
+        end_node = len(self._stamps) - 1
+        if self._stamps[end_node] != self._generation:
+            return [], math.inf
+
+        start_node = end_node - 1
+        nodes = [end]
+        node = int(self._parents[end_node])
+        while node != start_node:
+            nodes.append(int(self._node_cells.flat[node]))
+            node = int(self._parents[node])
+        nodes.append(start)
+        nodes.reverse()
+        return nodes, float(self._g_score[end_node])
+
+    def _refine(self, nodes: List[int], start: int, end: int) -> List[Tuple[int, int]]:
+        # every step of the abstract path is turned into cells, the moves out of a cluster
+        # are one cell and the paths inside of a cluster are searched (and kept between entrances)
+        path: List[Tuple[int, int]] = []
+        size = self.cluster_size
+        for a, b in zip(nodes, nodes[1:]):
+            cluster = self._cluster(a)
+            if cluster != self._cluster(b):
+                path.append(divmod(a, self.cols))
+                continue
+            key = (a, b)
+            cached = a != start and b != end
+            if cached and key in self._paths[cluster]:
+                path.extend(self._paths[cluster][key])
+                continue
+            grid = self._grids[cluster]
+            i = cluster // self._cluster_cols * size
+            j = cluster % self._cluster_cols * size
+            segment = [
+                (i + ci, j + cj)
+                for ci, cj in grid.find(
+                    divmod(self._local(a, cluster), grid.cols),
+                    divmod(self._local(b, cluster), grid.cols),
+                )
+            ]
+            if cached:
+                self._paths[cluster][key] = segment
+            path.extend(segment)
+        return path
+
+
+def astar(
+    grid: Union[np.ndarray, List[List[Union[int, float]]]],
+    start: Union[List[int], Tuple[int, int], Sequence[int]],
+    end: Union[List[int], Tuple[int, int], Sequence[int]],
+    weighted: bool = False,
+    diagonal: bool = False,
+    cut_corners: bool = False,
+) -> List[Tuple[int, int]]:
+    """
+    it finds the most efficient path from one point to another like pathfinding
+    but it searches over flat arrays so it doesnt have to make an object for every cell
+    (it is compiled with numba if it is installed), for many searches on the same grid use PathGrid
+    if the value of the grid is 0 then the algorithm can go there, anything else is a wall
+    with weighted the value of a cell is the cost to move into it and a negative or inf value is a wall,
+    with diagonal it can move diagonally too (cut_corners allows diagonal moves next to one wall)
+    the path starts with the start and it doesnt have the end, an empty list means that there is no path
+    :param grid: Union[np.ndarray, List[List[Union[int, float]]]]
+    :param start: Sequence[int]
+    :param end: Sequence[int]
+    :param weighted: bool
+    :param diagonal: bool
+    :param cut_corners: bool
+    :return: List[Tuple[int, int]]
+    """
+    return PathGrid(grid, weighted, diagonal, cut_corners).find(start, end)
+
+
+def jump_point_search(
+    grid: Union[np.ndarray, List[List[int]]],
+    start: Union[List[int], Tuple[int, int], Sequence[int]],
+    end: Union[List[int], Tuple[int, int], Sequence[int]],
+    diagonal: bool = False,
+) -> List[Tuple[int, int]]:
+    """
+    it finds the most efficient path from one point to another with jump point search,
+    it skips the cells where the path can only go straight so it is a lot faster than A*
+    on open grids (for many searches on the same grid use PathGrid with search="jps")
+    if the value of the grid is 0 then the algorithm can go there, anything else is a wall
+    with diagonal it can move diagonally too (but never next to a wall)
+    the path starts with the start and it doesnt have the end, an empty list means that there is no path
+    :param grid: Union[np.ndarray, List[List[int]]]
+    :param start: Sequence[int]
+    :param end: Sequence[int]
+    :param diagonal: bool
+    :return: List[Tuple[int, int]]
+    """
+    return PathGrid(grid, diagonal=diagonal, search="jps").find(start, end)
+
+
+def flow_field(
+    grid: Union[np.ndarray, List[List[Union[int, float]]]],
+    goals: Union[Sequence[int], Sequence[Sequence[int]]],
+    weighted: bool = False,
+    diagonal: bool = False,
+    cut_corners: bool = False,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    it finds the paths from every cell to the closest goal at once (a dijkstra map),
+    so many agents that go to the same goals only look up their next step
+    (for many flow fields on the same grid use PathGrid.flow_field)
+    the grid is the same as the grid of astar (with weighted, diagonal and cut_corners)
+    the distances are the costs of the paths to the closest goal (inf if there is no path)
+    and the directions are the (di, dj) step of every cell on its path ((0, 0) on the goals
+    and the cells without a path)
+    :param grid: Union[np.ndarray, List[List[Union[int, float]]]]
+    :param goals: Union[Sequence[int], Sequence[Sequence[int]]] a goal or a list of goals
+    :param weighted: bool
+    :param diagonal: bool
+    :param cut_corners: bool
+    :return: Tuple[np.ndarray, np.ndarray] distances (rows, cols), directions (rows, cols, 2)
+    """
+    return PathGrid(grid, weighted, diagonal, cut_corners).flow_field(goals)
+
+
+def build_pathfinding_numba() -> None:
+    grid = np.zeros((2, 2), dtype=np.int32)
+    astar(grid, (0, 0), (1, 1))
+    jump_point_search(grid, (0, 0), (1, 1))
+    jump_point_search(grid, (0, 0), (1, 1), diagonal=True)
+    HierarchicalPathGrid(np.zeros((4, 4), dtype=np.int32), 2).find((0, 0), (3, 3))
+    flow_field(grid, (0, 0))
+
+
+__all__ = [
+    "pathfinding",
+    "astar",
+    "jump_point_search",
+    "flow_field",
+    "PathGrid",
+    "HierarchicalPathGrid",
+]
@@ -0,0 +1,277 @@
+# MIT License
+#
+# Copyright (c) 2021 Emc2356
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+spatial structures for fast collision queries
+"""
+
+from typing import List, Tuple, Optional, Sequence
+
+from PygameHaze.types import *
+
+import numpy as np
+import pygame
+import math
+
+# the most cells that a grid has for every rect
+_CELLS_PER_RECT = 4
+
+
+def _rects_key(rects: Sequence[RectType]) -> Tuple[Tuple[float, ...], ...]:
+    return tuple(tuple(pygame.Rect(rect)) for rect in rects)
+
+
+class RectGrid:
+    """
+    a uniform grid over a set of static rects, every cell knows the rects that overlap with it
+    so only the rects that are near an area need to be tested
+
+    Parameters:
+    -----------
+    rects: Sequence[RectType]
+        the rects that are going to be indexed
+    cell_size: Optional[float]
+        the size of every cell, by default it is based on the size of the rects
+        (it is made bigger if the grid would have more than a few cells for every rect)
+
+    Methods:
+    -----------
+    matches(rects: Sequence[RectType]):
+        it checks if the grid was built with the given rects
+    query(x0, y0, x1, y1):
+        it returns every (box, rect) pair that overlaps for arrays of boxes
+    query_rect(rect: RectType):
+        it returns the indexes of the rects that overlap with a rect
+    """
+
+    __slots__ = "key", "edges", "cell_size", "origin", "cols", "rows", "starts", "items"
+
+    def __init__(
+        self, rects: Sequence[RectType], cell_size: Optional[float] = None
+    ) -> None:
+        self.key: Tuple[Tuple[float, ...], ...] = _rects_key(rects)
+        # left, top, right, bottom
+        self.edges: np.ndarray = np.array(
+            [(r[0], r[1], r[0] + r[2], r[1] + r[3]) for r in self.key],
+            dtype=np.float64,
+        ).reshape((-1, 4))
+
+        if self.edges.shape[0]:
+            if cell_size is None:
+                sizes = np.maximum(
+                    self.edges[:, 2] - self.edges[:, 0],
+                    self.edges[:, 3] - self.edges[:, 1],
+                )
+                cell_size = float(np.mean(sizes))
+            origin = self.edges[:, 0].min(), self.edges[:, 1].min()
+            extent = self.edges[:, 2].max(), self.edges[:, 3].max()
+        else:
+            origin = extent = (0.0, 0.0)
+        # small rects that are far apart would need a lot of empty cells between them,
+        # so the cells are made bigger until there are only a few for every rect
+        # (the area and the longest side of the grid are both limited)
+        width, height = extent[0] - origin[0], extent[1] - origin[1]
+        cells = _CELLS_PER_RECT * max(self.edges.shape[0], 1)
+        self.cell_size: float = max(
+            float(cell_size or 1),
+            1.0,
+            math.sqrt(width * height / cells),
+            max(width, height) / cells,
+        )
+        self.origin: Tuple[float, float] = origin
+        self.cols: int = max(math.ceil((extent[0] - origin[0]) / self.cell_size), 1)
+        self.rows: int = max(math.ceil((extent[1] - origin[1]) / self.cell_size), 1)
+
+        # every rect is added in all of the cells that it touches and then
+        # the pairs are sorted by the cell, it is stored as offsets (starts) + rect indexes (items)
+        cx0, cy0, cx1, cy1 = self._cells(*self.edges.T)
+        spans_x = cx1 - cx0 + 1
+        spans_y = cy1 - cy0 + 1
+        counts = spans_x * spans_y
+        owners = np.repeat(np.arange(self.edges.shape[0]), counts)
+        local = np.arange(owners.shape[0]) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        cells = (cy0[owners] + local // spans_x[owners]) * self.cols + (
+            cx0[owners] + local % spans_x[owners]
+        )
+        order = np.argsort(cells, kind="stable")
+        self.items: np.ndarray = owners[order]
+        self.starts: np.ndarray = np.zeros((self.cols * self.rows + 1,), dtype=np.int64)
+        np.cumsum(
+            np.bincount(cells, minlength=self.cols * self.rows), out=self.starts[1:]
+        )
+
+    def _cells(
+        self, x0: np.ndarray, y0: np.ndarray, x1: np.ndarray, y1: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        # the range of cells that an area covers, clamped to the grid
+        cs = self.cell_size
+        ox, oy = self.origin
+        cx0 = np.clip(np.floor((x0 - ox) / cs), 0, self.cols - 1).astype(np.int64)
+        cy0 = np.clip(np.floor((y0 - oy) / cs), 0, self.rows - 1).astype(np.int64)
+        cx1 = np.clip(np.floor((x1 - ox) / cs), 0, self.cols - 1).astype(np.int64)
+        cy1 = np.clip(np.floor((y1 - oy) / cs), 0, self.rows - 1).astype(np.int64)
+        return cx0, cy0, cx1, cy1
+
+    def __len__(self) -> int:
+        return self.edges.shape[0]
+
+    def matches(self, rects: Sequence[RectType]) -> bool:
+        """
+        it checks if the grid was built with the given rects (in the same order)
+        :param rects: Sequence[RectType]
+        :return: bool
+        """
+        return len(rects) == len(self.key) and _rects_key(rects) == self.key
+
+    @classmethod
+    def cached(
+        cls, grid: Optional["RectGrid"], rects: Sequence[RectType]
+    ) -> "RectGrid":
+        """
+        it returns the given grid if it was built with the same rects or else a new grid
+        :param grid: Optional[RectGrid]
+        :param rects: Sequence[RectType]
+        :return: RectGrid
+        """
+        if grid is not None and grid.matches(rects):
+            return grid
+        return cls(rects)
+
+    def query(
+        self, x0: np.ndarray, y0: np.ndarray, x1: np.ndarray, y1: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        it finds every pair of box and rect that overlap, the boxes are given as arrays of their edges
+        the pairs are sorted by the box index and then by the rect index
+        :param x0: the left side of the boxes
+        :param y0: the top side of the boxes
+        :param x1: the right side of the boxes
+        :param y1: the bottom side of the boxes
+        :return: Tuple[np.ndarray, np.ndarray] (box indexes, rect indexes)
+        """
+        x0 = np.asarray(x0, dtype=np.float64)
+        y0 = np.asarray(y0, dtype=np.float64)
+        x1 = np.asarray(x1, dtype=np.float64)
+        y1 = np.asarray(y1, dtype=np.float64)
+        m = self.edges.shape[0]
+        empty = np.empty((0,), dtype=np.int64)
+        if not m or not x0.size:
+            return empty, empty
+
+        ox, oy = self.origin
+        inside = np.flatnonzero(
+            (x1 >= ox)
+            & (y1 >= oy)
+            & (x0 < ox + self.cols * self.cell_size)
+            & (y0 < oy + self.rows * self.cell_size)
+        )
+        if not inside.size:
+            return empty, empty
+        cx0, cy0, cx1, cy1 = self._cells(x0[inside], y0[inside], x1[inside], y1[inside])
+        spans_x = cx1 - cx0 + 1
+        spans_y = cy1 - cy0 + 1
+
+        # the boxes are usually smaller than a cell so there are only a few offsets to go through
+        boxes = []
+        cells = []
+        for dy in range(int(spans_y.max())):
+            for dx in range(int(spans_x.max())):
+                sel = np.flatnonzero((dx < spans_x) & (dy < spans_y))
+                boxes.append(inside[sel])
+                cells.append((cy0[sel] + dy) * self.cols + cx0[sel] + dx)
+        boxes = np.concatenate(boxes)
+        cells = np.concatenate(cells)
+
+        starts = self.starts[cells]
+        counts = self.starts[cells + 1] - starts
+        occupied = np.flatnonzero(counts)
+        if not occupied.size:
+            return empty, empty
+        boxes, starts, counts = boxes[occupied], starts[occupied], counts[occupied]
+        total = int(counts.sum())
+        local = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        rects = self.items[np.repeat(starts, counts) + local]
+        boxes = np.repeat(boxes, counts)
+
+        # a rect can be found in more than one cell of a box
+        keys = boxes * m + rects
+        keys.sort()
+        keys = keys[np.r_[True, keys[1:] != keys[:-1]]]
+        boxes = keys // m
+        rects = keys % m
+
+        edges = self.edges[rects]
+        hit = (
+            (x0[boxes] < edges[:, 2])
+            & (edges[:, 0] < x1[boxes])
+            & (y0[boxes] < edges[:, 3])
+            & (edges[:, 1] < y1[boxes])
+        )
+        return boxes[hit], rects[hit]
+
+    def query_rect(self, rect: RectType) -> List[int]:
+        """
+        it returns the indexes (sorted) of the rects that overlap with the given rect
+        :param rect: RectType
+        :return: List[int]
+        """
+        x0, y0, w, h = pygame.Rect(rect)
+        return self.query_area(x0, y0, x0 + w, y0 + h)
+
+    def query_area(self, x0: float, y0: float, x1: float, y1: float) -> List[int]:
+        """
+        it returns the indexes (sorted) of the rects that overlap with the area between (x0, y0) and (x1, y1)
+        :return: List[int]
+        """
+        if not self.edges.shape[0]:
+            return []
+        ox, oy = self.origin
+        cs = self.cell_size
+        if x1 < ox or y1 < oy or x0 >= ox + self.cols * cs or y0 >= oy + self.rows * cs:
+            return []
+        cx0 = min(max(int((x0 - ox) // cs), 0), self.cols - 1)
+        cy0 = min(max(int((y0 - oy) // cs), 0), self.rows - 1)
+        cx1 = min(max(int((x1 - ox) // cs), 0), self.cols - 1)
+        cy1 = min(max(int((y1 - oy) // cs), 0), self.rows - 1)
+
+        found = set()
+        starts = self.starts
+        items = self.items
+        for cy in range(cy0, cy1 + 1):
+            for cell in range(cy * self.cols + cx0, cy * self.cols + cx1 + 1):
+                found.update(items[starts[cell] : starts[cell + 1]].tolist())
+
+        edges = self.edges
+        return [
+            i
+            for i in sorted(found)
+            if x0 < edges[i, 2]
+            and edges[i, 0] < x1
+            and y0 < edges[i, 3]
+            and edges[i, 1] < y1
+        ]
+
+
+__all__ = ["RectGrid"]
@@ -0,0 +1,109 @@
+# MIT License
+#
+# Copyright (c) 2021 Emc2356
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+"""
+a fixed timestep so the simulations run with the same dt no matter the frame time
+"""
+
+from typing import Iterator
+
+
+class FixedTimestep:
+    """
+    an accumulator that turns the variable time of every frame into fixed steps,
+    every step can be split into smaller substeps and the time that is left is used to
+    draw the simulations between two steps (render interpolation)
+
+    Parameters:
+    -----------
+    step: float
+        the dt of every step (in the same units as the dt of the simulations, 1 is one frame at 60 fps)
+    substeps: int
+        in how many updates every step is split
+    max_steps: int
+        the most steps that can run in one frame, the rest of the time is dropped so a frame hitch doesnt make it worse
+
+    Methods:
+    -----------
+    steps(dt: float):
+        it adds the time of a frame and it yields the dt of every update that needs to run
+    alpha:
+        how far the time is between the last two steps (0 to 1)
+    lag:
+        how far behind the last step the simulations should be drawn (the draw methods accept it)
+    reset():
+        it drops the accumulated time
+    """
+
+    __slots__ = "step", "substeps", "max_steps", "accumulator"
+
+    def __init__(self, step: float = 1, substeps: int = 1, max_steps: int = 5) -> None:
+        self.step: float = step
+        self.substeps: int = max(int(substeps), 1)
+        self.max_steps: int = max(int(max_steps), 1)
+        self.accumulator: float = 0.0
+
+    def steps(self, dt: float) -> Iterator[float]:
+        """
+        it adds the time of a frame to the accumulator and it yields the dt of every update,
+        for example: for h in timestep.steps(dt): cloth.update(h)
+        :param dt: the time of the frame
+        :return: Iterator[float]
+        """
+        self.accumulator += dt
+        count = int(self.accumulator // self.step)
+        if count > self.max_steps:
+            self.accumulator -= (count - self.max_steps) * self.step
+            count = self.max_steps
+        h = self.step / self.substeps
+        for _ in range(count):
+            self.accumulator -= self.step
+            for _ in range(self.substeps):
+                yield h
+
+    @property
+    def alpha(self) -> float:
+        """
+        how far the time is between the previous and the last step (0 to 1)
+        :return: float
+        """
+        return min(max(self.accumulator / self.step, 0.0), 1.0)
+
+    @property
+    def lag(self) -> float:
+        """
+        how far back in time the simulations are drawn so they are drawn between the last two steps
+        :return: float
+        """
+        return (1 - self.alpha) * self.step
+
+    def reset(self) -> None:
+        """
+        it drops the accumulated time
+        :return: None
+        """
+        self.accumulator = 0.0
+
+
+__all__ = ["FixedTimestep"]
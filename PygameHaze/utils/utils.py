@@ -37,9 +37,11 @@ from typing import (
     TypeVar,
     Any,
     Optional,
+    Dict,
 )
 from functools import lru_cache
 
+import numpy as np
 import pygame
 import json
 
@@ -220,6 +222,122 @@ def read_json(path: PathType) -> dict:
         return json.loads(f.read())
 
 
+# the version of the binary cloth files
+CLOTH_BINARY_VERSION: int = 1
+
+
+def read_cloth_binary(path: PathType) -> Dict[str, np.ndarray]:
+    """
+    it reads a binary cloth file (a .npz file) straight into arrays:
+    points (N, 2), locked (N,), gravity (N,), connections (M, 2), lengths (M,) and colors (M,) if it was saved
+    :param path: str
+    :return: Dict[str, np.ndarray]
+    """
+    with np.load(path) as f:
+        version = int(f["version"])
+        if version > CLOTH_BINARY_VERSION:
+            raise ValueError(f"unsupported cloth file version '{version}'")
+        data = {
+            "points": f["points"].astype(np.float64),
+            "locked": f["locked"].astype(np.bool_),
+            "gravity": f["gravity"].astype(np.float64),
+            "connections": f["connections"].astype(np.int64),
+            "lengths": f["lengths"].astype(np.float64),
+        }
+        if "colors" in f.files:
+            data["colors"] = f["colors"].astype(np.int64)
+    return data
+
+
+def write_cloth_binary(
+    path: PathType,
+    points: np.ndarray,
+    locked: np.ndarray,
+    gravity: np.ndarray,
+    connections: np.ndarray,
+    lengths: np.ndarray,
+    colors: Optional[np.ndarray] = None,
+) -> None:
+    """
+    it writes the arrays of a cloth to a binary cloth file (a .npz file),
+    the floats are kept as 64 bit floats so a cloth is loaded back exactly as it was saved
+    :param path: str
+    :param points: an (N, 2) array with the positions of the points
+    :param locked: an (N,) bool array
+    :param gravity: an (N,) array with the gravity of every point
+    :param connections: an (M, 2) array with the indexes of the points of every connection
+    :param lengths: an (M,) array with the length of every connection
+    :param colors: an (M,) array with the color of every connection (so it doesnt have to be colored when it is loaded)
+    :return: None
+    """
+    arrays = {
+        "version": np.array(CLOTH_BINARY_VERSION),
+        "points": np.asarray(points, dtype=np.float64).reshape((-1, 2)),
+        "locked": np.asarray(locked, dtype=np.bool_).reshape(-1),
+        "gravity": np.asarray(gravity, dtype=np.float64).reshape(-1),
+        "connections": np.asarray(connections, dtype=np.int32).reshape((-1, 2)),
+        "lengths": np.asarray(lengths, dtype=np.float64).reshape(-1),
+    }
+    if colors is not None:
+        colors = np.asarray(colors).reshape(-1)
+        # there are rarely more colors than the most connections of a point + 1
+        arrays["colors"] = colors.astype(
+            np.uint8 if colors.max(initial=0) < 256 else np.int32
+        )
+    # a file object so numpy does not add a .npz extension
+    with open(path, "wb") as f:
+        np.savez(f, **arrays)
+
+
+def cloth_json_to_binary(src: PathType, dst: PathType) -> None:
+    """
+    it converts a json cloth file (like the ones in tools/cloths) to a binary cloth file
+    :param src: the json file
+    :param dst: the binary file
+    :return: None
+    """
+    from PygameHaze.Classes.cloth import _color_connections
+
+    data = read_json(src)
+    points = data["points"]
+    connections = np.array(
+        [cn[:2] for cn in data["connections"]], dtype=np.int64
+    ).reshape((-1, 2))
+    write_cloth_binary(
+        dst,
+        [p[:2] for p in points],
+        [p[2] for p in points],
+        [p[3] if len(p) > 3 else 0.2 for p in points],
+        connections,
+        [cn[2] for cn in data["connections"]],
+        _color_connections(connections[:, 0], connections[:, 1]),
+    )
+
+
+def cloth_binary_to_json(src: PathType, dst: PathType) -> None:
+    """
+    it converts a binary cloth file to a json cloth file
+    :param src: the binary file
+    :param dst: the json file
+    :return: None
+    """
+    data = read_cloth_binary(src)
+    points = [
+        [x, y, locked, gravity]
+        for (x, y), locked, gravity in zip(
+            data["points"].tolist(), data["locked"].tolist(), data["gravity"].tolist()
+        )
+    ]
+    connections = [
+        [a, b, length]
+        for (a, b), length in zip(
+            data["connections"].tolist(), data["lengths"].tolist()
+        )
+    ]
+    with open(dst, "w") as f:
+        json.dump({"points": points, "connections": connections}, f, indent=4)
+
+
 def get_neighbors(
     grid: List[List[NeighborOutputType]],
     target: Union[Tuple[int, int], List[int], Sequence[int]],
@@ -299,6 +417,10 @@ __all__ = [
     "blit_list",
     "flatten",
     "read_json",
+    "read_cloth_binary",
+    "write_cloth_binary",
+    "cloth_json_to_binary",
+    "cloth_binary_to_json",
     "get_neighbors",
     "get_neighbors_index",
     "combine_rects",
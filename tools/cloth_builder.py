@@ -1,4 +1,4 @@
-from tkinter.filedialog import asksaveasfile
+from tkinter.filedialog import asksaveasfilename
 from typing import Dict, Union
 import PygameHaze as pgh
 import pygame
@@ -54,16 +54,33 @@ class ClothBuilder:
         file_extensions = [
             ["JSON files", "*.json"],
             ["cloth files", "*.cloth"],
+            ["binary cloth files", "*.npz"],
             ["All files", "*.*"]
         ]
-        f = asksaveasfile(filetypes=file_extensions, defaultextension=file_extensions, title="Save As",
-                          initialfile="untitled", mode="w")
-        if f is not None:
-            try:
-                json.dump(self.data, f, indent=4)
-                f.close()
-            except IOError:
-                f.close()
+        path = asksaveasfilename(filetypes=file_extensions, defaultextension=file_extensions, title="Save As",
+                                 initialfile="untitled")
+        if not path:
+            return
+        indexes = {id(point): i for i, point in enumerate(self.data["points"])}
+        data = {
+            "points": [pgh.Point.save(point) for point in self.data["points"]],
+            "connections": [pgh.Connection.save(cn, indexes) for cn in self.data["connections"]]
+        }
+        try:
+            if path.lower().endswith(".npz"):
+                pgh.write_cloth_binary(
+                    path,
+                    [p[:2] for p in data["points"]],
+                    [p[2] for p in data["points"]],
+                    [p[3] for p in data["points"]],
+                    [cn[:2] for cn in data["connections"]],
+                    [cn[2] for cn in data["connections"]]
+                )
+            else:
+                with open(path, "w") as f:
+                    json.dump(data, f, indent=4)
+        except IOError:
+            pass
 
     def event_handler(self) -> None:
         for event in pygame.event.get():
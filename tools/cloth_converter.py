@@ -0,0 +1,21 @@
+from typing import List
+import PygameHaze as pgh
+import sys
+import os
+
+
+def run(args: List[str]) -> None:
+    if len(args) != 2:
+        print("usage: python cloth_converter.py <source> <destination>", file=sys.stderr)
+        print("  a .npz destination is written as a binary cloth, anything else as json", file=sys.stderr)
+        quit(-1)
+    src, dst = args
+    if os.path.splitext(dst)[1].lower() == ".npz":
+        pgh.cloth_json_to_binary(src, dst)
+    else:
+        pgh.cloth_binary_to_json(src, dst)
+    print(f"{src} -> {dst}")
+
+
+if __name__ == '__main__':
+    run(sys.argv[1:])